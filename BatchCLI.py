@@ -0,0 +1,203 @@
+"""
+BatchCLI.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Неинтерактивный пакетный решатель.
+Читает задачи в формате JSONL (из файла или stdin), раздаёт их пулу рабочих процессов
+и выводит результаты в JSONL по мере готовности (или в порядке ввода с --ordered).
+В работе одновременно не больше window задач, поэтому поток любой длины
+обрабатывается в ограниченной памяти.
+
+Задача (все поля, кроме disks, необязательны):
+    {"id": "p1", "disks": 5, "rods": [[5, 4], [3, 2, 1], []], "goal": [[], [], [5, 4, 3, 2, 1]],
+     "num_rods": 3, "strategy": "solve_wide", "max_depth": 40, "time_limit": 2.5,
+     "gradient": false, "packed": true}
+По умолчанию начало - башня на первом стержне, цель - башня на последнем.
+time_limit проверяется через наблюдатель Solver.solve_with_stats: раз в 256 раскрытий,
+а у solve_vectorized и solve_external - после каждого уровня / блока чтения.
+Результат:
+    {"index": 0, "id": "p1", "found": true, "count": 31, "moves": [["A", "C"], ...], "stats": {...}}
+или {"index": 0, "id": "p1", "error": "..."}.
+
+Запуск:
+    python BatchCLI.py puzzles.jsonl --workers 8 > results.jsonl
+    cat puzzles.jsonl | python BatchCLI.py --ordered
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, TextIO, Tuple
+
+from HanoiTower import get_next_situations
+from Solver import Solver
+
+DEFAULT_STRATEGY = 'solve_wide'
+STRATEGIES = ('solve', 'solve_wide', 'solve_bidirectional', 'solve_branches_and_bounds', 'solve_iterative_deepening',
+              'solve_vectorized', 'solve_external')
+
+
+class TimeLimitExceeded(Exception):
+    """Поиск не уложился в time_limit задачи."""
+
+
+class SearchCancelled(Exception):
+    """Поиск отменён извне (см. SolverService)."""
+
+
+def _tower(num_disks: int, num_rods: int, rod_idx: int) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(tuple(range(num_disks, 0, -1)) if i == rod_idx else () for i in range(num_rods))
+
+
+def _situation(rods: Sequence[Sequence[int]], num_disks: int) -> Tuple[Tuple[int, ...], ...]:
+    """Проверить и привести к кортежам описание стержней из задачи."""
+    situation = tuple(tuple(int(disk) for disk in disks) for disks in rods)
+    if sorted(disk for disks in situation for disk in disks) != list(range(1, num_disks + 1)):
+        raise ValueError(f"На стержнях должны быть диски 1..{num_disks}, каждый по одному разу.")
+    if any(list(disks) != sorted(disks, reverse=True) for disks in situation):
+        raise ValueError("Диски на стержне должны лежать снизу вверх по убыванию.")
+    return situation
+
+
+def _make_observer(time_limit: Optional[float], cancel_event: Optional[Any]) -> Optional[Callable[[Any], None]]:
+    """Наблюдатель для solve_with_stats, прерывающий поиск по time_limit или cancel_event (None - не нужен)."""
+    if time_limit is None and cancel_event is None:
+        return None
+    deadline = time.perf_counter() + float(time_limit) if time_limit is not None else None
+
+    def observer(stats: Any) -> None:
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeLimitExceeded(f"Превышено время {time_limit} с.")
+        if cancel_event is not None and cancel_event.is_set():
+            raise SearchCancelled("Поиск отменён.")
+
+    return observer
+
+
+def solve_spec(spec: Dict[str, Any], include_moves: bool = True, cancel_event: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Решить одну задачу (выполняется в рабочем процессе).
+    Args:
+        spec: Описание задачи.
+        include_moves: Включить ходы в результат.
+        cancel_event: Событие (например, multiprocessing.Manager().Event()), установка которого прерывает поиск.
+    """
+    num_disks = int(spec['disks'])
+    num_rods = int(spec.get('num_rods', len(spec['rods']) if 'rods' in spec else 3))
+    start = _situation(spec['rods'], num_disks) if 'rods' in spec else _tower(num_disks, num_rods, 0)
+    goal = _situation(spec['goal'], num_disks) if 'goal' in spec else _tower(num_disks, num_rods, num_rods - 1)
+    if len(start) != num_rods or len(goal) != num_rods:
+        raise ValueError(f"Ожидается {num_rods} стержней.")
+    strategy = spec.get('strategy', DEFAULT_STRATEGY)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия: {strategy}.")
+
+    max_depth = int(spec.get('max_depth', 2 ** num_disks - 1 if num_rods == 3 else 3 ** num_disks))
+    solver = Solver(max_depth=max_depth, num_disks=num_disks, gradient=bool(spec.get('gradient', False)),
+                    packed=bool(spec.get('packed', True)), num_rods=num_rods)
+
+    observer = _make_observer(spec.get('time_limit'), cancel_event)
+    path, stats = solver.solve_with_stats(strategy, start, goal, get_next_situations, observer=observer, every=256)
+    result = {'found': path is not None, 'count': None if path is None else len(path)}
+    if include_moves:
+        result['moves'] = None if path is None else [list(move) for move in path]
+    result['stats'] = stats.to_dict()
+    return result
+
+
+def _run_one(index: int, line: str, include_moves: bool) -> Dict[str, Any]:
+    """Разобрать строку и решить задачу; любые ошибки превращаются в поле error."""
+    result: Dict[str, Any] = {'index': index}
+    try:
+        spec = json.loads(line)
+        if isinstance(spec, dict) and 'id' in spec:
+            result['id'] = spec['id']
+        result.update(solve_spec(spec, include_moves))
+    except Exception as e:  # Одна плохая задача не должна останавливать весь пакет
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_batch(lines: Iterable[str], out: TextIO, workers: Optional[int] = None, ordered: bool = False,
+              window: Optional[int] = None, include_moves: bool = True) -> int:
+    """
+    Решить поток задач в пуле процессов.
+    Args:
+        lines: Строки JSONL (пустые пропускаются).
+        out: Куда писать результаты.
+        workers: Число процессов (по умолчанию - число ядер).
+        ordered: Выводить в порядке ввода, а не по готовности.
+        window: Сколько задач держать в работе одновременно (по умолчанию - 4 на процесс).
+        include_moves: Выводить ходы (иначе только их число и статистику).
+    Returns:
+        Число обработанных задач.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = window or 4 * workers
+        pending: Dict[Future, int] = {}
+        finished: Dict[int, Dict[str, Any]] = {}  # Готовые, но ещё не выведенные (ordered)
+        next_to_write = 0
+        count = 0
+
+        def emit(result: Dict[str, Any]) -> None:
+            out.write(json.dumps(result, ensure_ascii=False) + '\n')
+            out.flush()
+
+        def drain(block_until: int) -> None:
+            nonlocal next_to_write
+            while len(pending) > block_until:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    result = future.result()
+                    if not ordered:
+                        emit(result)
+                        continue
+                    finished[index] = result
+                    while next_to_write in finished:
+                        emit(finished.pop(next_to_write))
+                        next_to_write += 1
+
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            pending[pool.submit(_run_one, count, line, include_moves)] = count
+            count += 1
+            drain(window - 1)
+        drain(0)
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетное решение задач Ханойской башни (JSONL -> JSONL)")
+    parser.add_argument('input', nargs='?', default='-', help="Файл задач JSONL (по умолчанию stdin)")
+    parser.add_argument('--output', '-o', default='-', help="Файл результатов (по умолчанию stdout)")
+    parser.add_argument('--workers', '-j', type=int, help="Число рабочих процессов")
+    parser.add_argument('--ordered', action='store_true', help="Выводить результаты в порядке ввода")
+    parser.add_argument('--window', type=int, help="Сколько задач держать в работе одновременно")
+    parser.add_argument('--no-moves', action='store_true', help="Не выводить сами ходы")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        run_batch(source, target, args.workers, args.ordered, args.window, not args.no_moves)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
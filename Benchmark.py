@@ -0,0 +1,231 @@
+"""
+Benchmark.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Воспроизводимый замер стратегий Solver.
+Перебираются стратегии (solve, solve_wide, solve_branches_and_bounds), упорядочивание ходов
+(gradient), представление состояний (кортежи / упакованные числа), число дисков 3..N,
+число стержней (по умолчанию 3 и 4) и случайные допустимые начальные конфигурации (генератор с фиксированным seed).
+Для каждого случая записываются время (минимум из нескольких повторов), число раскрытых узлов
+и пиковая память (tracemalloc, отдельным прогоном, чтобы не искажать время).
+Результаты сохраняются в JSON или CSV (по расширению файла); режим compare повторяет
+замер с параметрами базового файла и отмечает регрессии сверх заданного порога.
+
+Запуск:
+    python Benchmark.py run --max-disks 6 --starts 3 --output baseline.json
+    python Benchmark.py compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from HanoiTower import get_next_situations
+from Solver import Solver
+
+STRATEGIES = ('solve', 'solve_wide', 'solve_branches_and_bounds')
+ENCODINGS = ('tuple', 'packed')
+ROD_COUNTS = (3, 4)
+FIELDS = ('strategy', 'gradient', 'encoding', 'num_disks', 'num_rods', 'start_id', 'start', 'found', 'path_length',
+          'wall_time', 'nodes_expanded', 'peak_memory')
+KEY_FIELDS = ('strategy', 'gradient', 'encoding', 'num_disks', 'num_rods', 'start_id')
+# Метрики, по которым ищутся регрессии
+METRICS = ('wall_time', 'nodes_expanded', 'peak_memory')
+
+
+def random_situation(num_disks: int, rng: random.Random, num_rods: int = 3) -> Tuple[Tuple[int, ...], ...]:
+    """Случайная допустимая конфигурация: каждый диск на случайном стержне, снизу вверх по убыванию."""
+    rods: List[List[int]] = [[] for _ in range(num_rods)]
+    for disk in range(num_disks, 0, -1):
+        rods[rng.randrange(len(rods))].append(disk)
+    return tuple(tuple(disks) for disks in rods)
+
+
+def iter_cases(min_disks: int, max_disks: int, starts: int, seed: int,
+               strategies: Sequence[str] = STRATEGIES, encodings: Sequence[str] = ENCODINGS,
+               rod_counts: Sequence[int] = ROD_COUNTS) -> Iterator[Dict[str, Any]]:
+    """Перебрать случаи замера; начальные конфигурации зависят только от seed, числа дисков и стержней."""
+    for num_rods in rod_counts:
+        for num_disks in range(min_disks, max_disks + 1):
+            # Для трёх стержней seed прежний, чтобы старые базовые файлы сравнивались с теми же начальными
+            rng = random.Random(f"{seed}:{num_disks}" if num_rods == 3 else f"{seed}:{num_disks}:{num_rods}")
+            situations = [tuple(tuple(range(num_disks, 0, -1)) if i == 0 else () for i in range(num_rods))]
+            situations += [random_situation(num_disks, rng, num_rods) for _ in range(starts)]
+            for strategy in strategies:
+                for gradient in (False, True):
+                    for encoding in encodings:
+                        for start_id, start in enumerate(situations):
+                            yield dict(strategy=strategy, gradient=gradient, encoding=encoding, num_disks=num_disks,
+                                       num_rods=num_rods, start_id=start_id, start=start)
+
+
+def run_case(case: Dict[str, Any], repeat: int = 3, measure_memory: bool = True) -> Dict[str, Any]:
+    """Замерить один случай."""
+    num_disks, num_rods = case['num_disks'], case['num_rods']
+    goal = tuple(tuple(range(num_disks, 0, -1)) if i == num_rods - 1 else () for i in range(num_rods))
+    packed = case['encoding'] == 'packed'
+    # num_rods задаётся только для упаковки: кортежные ситуации несут число стержней сами
+    solver = Solver(max_depth=3 ** num_disks, num_disks=num_disks, gradient=case['gradient'], packed=packed,
+                    num_rods=num_rods if packed else 3)
+    search = getattr(solver, case['strategy'])
+
+    wall_time = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        path = search(case['start'], goal, get_next_situations)
+        wall_time = min(wall_time, time.perf_counter() - started)
+
+    _, stats = solver.solve_with_stats(case['strategy'], case['start'], goal, get_next_situations,
+                                       trace_memory=measure_memory)
+    return dict(case, start=json.dumps(case['start']), found=path is not None,
+                path_length=None if path is None else len(path), wall_time=wall_time,
+                nodes_expanded=stats.nodes_expanded, peak_memory=stats.peak_memory)
+
+
+def run(min_disks: int, max_disks: int, starts: int, seed: int, repeat: int = 3, measure_memory: bool = True,
+        strategies: Sequence[str] = STRATEGIES, encodings: Sequence[str] = ENCODINGS,
+        rod_counts: Sequence[int] = ROD_COUNTS, verbose: bool = True) -> Dict[str, Any]:
+    """Выполнить весь замер; вернуть параметры и результаты."""
+    results = []
+    for case in iter_cases(min_disks, max_disks, starts, seed, strategies, encodings, rod_counts):
+        result = run_case(case, repeat, measure_memory)
+        results.append(result)
+        if verbose:
+            print(f"{result['strategy']:27s} gradient={int(result['gradient'])} {result['encoding']:6s} "
+                  f"n={result['num_disks']:2d} k={result['num_rods']} start={result['start_id']:2d}  "
+                  f"{result['wall_time'] * 1000:10.2f} мс  узлов: {result['nodes_expanded']:8d}", file=sys.stderr)
+    params = dict(min_disks=min_disks, max_disks=max_disks, starts=starts, seed=seed, repeat=repeat,
+                  measure_memory=measure_memory, strategies=list(strategies), encodings=list(encodings),
+                  rod_counts=list(rod_counts))
+    return dict(params=params, python=sys.version.split()[0], results=results)
+
+
+def save(report: Dict[str, Any], path: str) -> None:
+    """Сохранить отчёт: CSV (только результаты, параметры - в комментарии первой строки) или JSON."""
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            f.write('# ' + json.dumps(report['params']) + '\n')
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(report['results'])
+    else:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=1)
+
+
+def load(path: str) -> Dict[str, Any]:
+    """Загрузить отчёт, сохранённый save()."""
+    if not path.endswith('.csv'):
+        with open(path) as f:
+            return json.load(f)
+    with open(path, newline='') as f:
+        params = json.loads(f.readline()[2:])
+        results = []
+        for row in csv.DictReader(f):
+            row['gradient'] = row['gradient'] == 'True'
+            row['found'] = row['found'] == 'True'
+            row['num_rods'] = int(row.get('num_rods') or 3)
+            for field in ('num_disks', 'start_id', 'nodes_expanded'):
+                row[field] = int(row[field])
+            row['path_length'] = int(row['path_length']) if row['path_length'] else None
+            row['peak_memory'] = int(row['peak_memory']) if row['peak_memory'] else None
+            row['wall_time'] = float(row['wall_time'])
+            results.append(row)
+    return dict(params=params, results=results)
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple:
+    """Ключ случая; в отчётах до появления num_rods все случаи - на трёх стержнях."""
+    return tuple(result.get(k, 3) if k == 'num_rods' else result[k] for k in KEY_FIELDS)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.2,
+            min_time: float = 1e-3) -> List[str]:
+    """
+    Сравнить два отчёта.
+    Args:
+        baseline: Базовый отчёт.
+        current: Новый отчёт.
+        threshold: Допустимый относительный рост метрики (0.2 = 20%).
+        min_time: Время меньше этого порога (с) не сравнивается - слишком шумно.
+    Returns:
+        Список описаний регрессий (пустой, если их нет).
+    """
+    base = {_case_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        key = _case_key(result)
+        old = base.get(key)
+        if old is None:
+            continue
+        name = f"{key[0]} gradient={int(key[1])} {key[2]} n={key[3]} k={key[4]} start={key[5]}"
+        if old['found'] and (not result['found'] or result['path_length'] > old['path_length']):
+            regressions.append(f"{name}: длина пути {old['path_length']} -> {result['path_length']}")
+        for metric in METRICS:
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if metric == 'wall_time' and max(before, after) < min_time:
+                continue
+            if after > before * (1 + threshold):
+                regressions.append(f"{name}: {metric} {before:.6g} -> {after:.6g} "
+                                   f"(+{(after / before - 1) * 100 if before else float('inf'):.1f}%)")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замер стратегий Solver")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Выполнить замер и сохранить базовый файл")
+    run_parser.add_argument('--min-disks', type=int, default=3)
+    run_parser.add_argument('--max-disks', type=int, default=6)
+    run_parser.add_argument('--starts', type=int, default=3, help="Случайных начальных конфигураций на n")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--repeat', type=int, default=3, help="Повторов замера времени")
+    run_parser.add_argument('--no-memory', action='store_true', help="Не измерять пиковую память")
+    run_parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=STRATEGIES)
+    run_parser.add_argument('--encodings', nargs='+', default=list(ENCODINGS), choices=ENCODINGS)
+    run_parser.add_argument('--rods', nargs='+', type=int, default=list(ROD_COUNTS), help="Числа стержней")
+    run_parser.add_argument('--output', default='benchmark.json', help="Файл .json или .csv")
+
+    compare_parser = commands.add_parser('compare', help="Повторить замер и сравнить с базовым файлом")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('--current', help="Готовый отчёт вместо нового замера")
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+    compare_parser.add_argument('--output', help="Сохранить новый отчёт")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        report = run(args.min_disks, args.max_disks, args.starts, args.seed, args.repeat, not args.no_memory,
+                     args.strategies, args.encodings, args.rods)
+        save(report, args.output)
+        return 0
+
+    baseline = load(args.baseline)
+    if args.current:
+        current = load(args.current)
+    else:
+        params = baseline['params']
+        current = run(params['min_disks'], params['max_disks'], params['starts'], params['seed'], params['repeat'],
+                      params['measure_memory'], params['strategies'], params['encodings'],
+                      params.get('rod_counts', [3]))
+    if args.output:
+        save(current, args.output)
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"РЕГРЕССИЯ {line}")
+    print(f"Случаев: {len(current['results'])}, регрессий: {len(regressions)}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
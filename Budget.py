@@ -0,0 +1,159 @@
+"""
+Budget.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Ограниченный по ресурсам поиск с сохранением и продолжением.
+SearchBudget задаёт пределы: время, число раскрытых узлов, число хранимых состояний,
+а также файл контрольной точки и частоту её записи.
+BudgetRun - состояние одного запуска: стратегия Solver опрашивает его на каждом раскрытии,
+а при исчерпании бюджета (и периодически) в файл пишется снимок фронта, посещённых
+состояний и лучшего найденного решения, из которого поиск можно продолжить в другом процессе.
+SearchOutcome - результат: путь (полный или лучший частичный), причина остановки и нижняя граница.
+"""
+
+import os
+import pickle
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CHECKPOINT_VERSION = 1
+
+# Причины остановки
+TIME = 'time'
+EXPANDED = 'expanded'
+STATES = 'states'
+
+
+class SearchBudget:
+    """Пределы ресурсов для Solver.solve_anytime."""
+
+    def __init__(self, time_limit: Optional[float] = None, max_expanded: Optional[int] = None,
+                 max_states: Optional[int] = None, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: Optional[float] = None):
+        """
+        Args:
+            time_limit: Время на поиск, с.
+            max_expanded: Максимум раскрытых узлов (с учётом запусков до продолжения).
+            max_states: Максимум состояний в памяти (дерево / множество посещённых).
+            checkpoint_path: Файл контрольной точки (пишется при исчерпании бюджета).
+            checkpoint_every: Дополнительно писать контрольную точку каждые столько секунд.
+        """
+        self.time_limit = time_limit
+        self.max_expanded = max_expanded
+        self.max_states = max_states
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+
+
+class SearchOutcome:
+    """Результат поиска с бюджетом."""
+
+    def __init__(self, path: Optional[List[Tuple[str, str]]], reached_goal: bool, exhausted: Optional[str],
+                 lower_bound: Optional[float], expanded: int, checkpoint_path: Optional[str] = None):
+        """
+        Args:
+            path: Решение, лучший частичный путь (к состоянию с наименьшей оценкой) или None.
+            reached_goal: Путь ведёт в цель.
+            exhausted: Причина остановки по бюджету (TIME, EXPANDED, STATES) или None - поиск завершён.
+            lower_bound: Нижняя граница длины решения (для ветвей и границ - при допустимой эвристике).
+            expanded: Раскрыто узлов всего (с учётом продолжений).
+            checkpoint_path: Файл, из которого можно продолжить (None - не записан).
+        """
+        self.path = path
+        self.reached_goal = reached_goal
+        self.exhausted = exhausted
+        self.lower_bound = lower_bound
+        self.expanded = expanded
+        self.checkpoint_path = checkpoint_path
+
+    @property
+    def complete(self) -> bool:
+        """Поиск завершился сам, а не по бюджету."""
+        return self.exhausted is None
+
+    def __repr__(self) -> str:
+        length = None if self.path is None else len(self.path)
+        return (f"SearchOutcome(path_length={length}, reached_goal={self.reached_goal}, "
+                f"exhausted={self.exhausted!r}, lower_bound={self.lower_bound}, expanded={self.expanded})")
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Прочитать контрольную точку."""
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Файл {path} не является контрольной точкой версии {CHECKPOINT_VERSION}.")
+    return checkpoint
+
+
+class BudgetRun:
+    """Учёт ресурсов одного запуска; стратегия вызывает tick() перед каждым раскрытием."""
+
+    def __init__(self, budget: SearchBudget, meta: Dict[str, Any], resume: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            budget: Пределы.
+            meta: Описание задачи (стратегия, начало, цель, ...), сверяется при продолжении.
+            resume: Загруженная контрольная точка или None.
+        """
+        if resume is not None and resume['meta'] != meta:
+            raise ValueError("Контрольная точка относится к другой задаче или стратегии.")
+        self.budget = budget
+        self.meta = meta
+        self.resume = resume['search'] if resume is not None else None
+        self.expanded = resume['expanded'] if resume is not None else 0
+        self.exhausted: Optional[str] = None
+        self.lower_bound: Optional[float] = None
+        self.reached_goal = False  # Частичный результат стратегии - уже решение (лучшее найденное)
+        self.checkpoint_written = False
+        started = time.perf_counter()
+        self._deadline = started + budget.time_limit if budget.time_limit is not None else None
+        self._next_checkpoint = started + budget.checkpoint_every if budget.checkpoint_every else None
+        self._snapshot: Optional[Callable[[], Dict[str, Any]]] = None
+
+    def attach(self, snapshot: Callable[[], Dict[str, Any]]) -> None:
+        """Подключить функцию, возвращающую снимок состояния стратегии."""
+        self._snapshot = snapshot
+
+    def tick(self, resident: int) -> bool:
+        """
+        Учесть очередное раскрытие.
+        Args:
+            resident: Сколько состояний сейчас хранится.
+        Returns:
+            True, если бюджет исчерпан и поиск нужно остановить.
+        """
+        budget = self.budget
+        if budget.max_expanded is not None and self.expanded >= budget.max_expanded:
+            self.exhausted = EXPANDED
+        elif budget.max_states is not None and resident >= budget.max_states:
+            self.exhausted = STATES
+        elif self._deadline is not None or self._next_checkpoint is not None:
+            now = time.perf_counter()
+            if self._deadline is not None and now >= self._deadline:
+                self.exhausted = TIME
+            elif self._next_checkpoint is not None and now >= self._next_checkpoint:
+                self.save()
+                self._next_checkpoint = time.perf_counter() + budget.checkpoint_every
+        if self.exhausted is not None:
+            self.save()
+            return True
+        self.expanded += 1
+        return False
+
+    def save(self) -> None:
+        """Записать контрольную точку (атомарно: через временный файл)."""
+        path = self.budget.checkpoint_path
+        if path is None or self._snapshot is None:
+            return
+        checkpoint = dict(version=CHECKPOINT_VERSION, meta=self.meta, expanded=self.expanded,
+                          search=self._snapshot())
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.checkpoint_written = True
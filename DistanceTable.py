@@ -0,0 +1,112 @@
+"""
+DistanceTable.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Таблица расстояний до фиксированной цели для пакетных запросов.
+Один обратный поиск в ширину от цели обходит все 3^n состояний и записывает
+расстояния в плотный массив по рангу (uint16, при n > 15 - uint32).
+После этого решение для любого начального состояния строится за O(длина пути):
+на каждом шаге выбирается сосед с расстоянием на единицу меньше.
+Таблицу можно сохранить на диск и загрузить повторно.
+"""
+
+import struct
+from array import array
+from collections import deque
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from PackedState import get_engine
+from RankedSet import NUM_RODS, rank_situation
+
+MAGIC = b'HDST'
+HEADER = struct.Struct('<4sBBcQ')  # magic, version, num_disks, typecode, упакованная цель
+VERSION = 1
+
+
+class DistanceTable:
+    """Расстояния от всех состояний до одной цели."""
+
+    def __init__(self, num_disks: int, goal_situation: Any, distances: array):
+        """
+        Args:
+            num_disks: Количество дисков.
+            goal_situation: Целевое состояние (кортежи или упакованное число).
+            distances: Массив расстояний по рангу состояния (максимум типа - недостижимо).
+        """
+        self.num_disks = num_disks
+        self.engine = get_engine(num_disks)
+        self.goal = goal_situation if isinstance(goal_situation, int) else self.engine.encode(goal_situation)
+        self.distances = distances
+        self._unset = (1 << (8 * distances.itemsize)) - 1
+
+    @classmethod
+    def build(cls, num_disks: int, goal_situation: Any) -> 'DistanceTable':
+        """Построить таблицу обратным поиском в ширину от цели."""
+        engine = get_engine(num_disks)
+        goal = goal_situation if isinstance(goal_situation, int) else engine.encode(goal_situation)
+        # Расстояния не больше 2^n - 1; максимум типа занят под "недостижимо", поэтому uint16 - только до n = 15
+        typecode = 'H' if num_disks <= 15 else 'I'
+        unset = (1 << (8 * array(typecode).itemsize)) - 1
+        distances = array(typecode, [unset]) * (NUM_RODS ** num_disks)
+
+        distances[rank_situation(goal, num_disks)] = 0
+        queue = deque([goal])
+        # Ходы обратимы, поэтому прямые преемники совпадают с предшественниками
+        while queue:
+            state = queue.popleft()
+            distance = distances[rank_situation(state, num_disks)] + 1
+            for next_state, _, _ in engine.iter_successors(state):
+                rank = rank_situation(next_state, num_disks)
+                if distances[rank] == unset:
+                    distances[rank] = distance
+                    queue.append(next_state)
+        return cls(num_disks, goal, distances)
+
+    def save(self, path: str) -> None:
+        """Сохранить таблицу в файл."""
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.num_disks, self.distances.typecode.encode(), self.goal))
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> 'DistanceTable':
+        """Загрузить таблицу из файла."""
+        with open(path, 'rb') as f:
+            magic, version, num_disks, typecode, goal = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Файл {path} не является таблицей расстояний версии {VERSION}.")
+            distances = array(typecode.decode())
+            distances.fromfile(f, NUM_RODS ** num_disks)
+        return cls(num_disks, goal, distances)
+
+    def distance(self, situation: Any) -> Optional[int]:
+        """Расстояние до цели или None, если цель недостижима."""
+        distance = self.distances[rank_situation(situation, self.num_disks)]
+        return None if distance == self._unset else distance
+
+    def get_path(self, situation: Any) -> Optional[List[Tuple[str, str]]]:
+        """Кратчайший путь до цели: спуск по строго убывающим расстояниям."""
+        engine = self.engine
+        state = situation if isinstance(situation, int) else engine.encode(situation)
+        distance = self.distance(state)
+        if distance is None:
+            return None
+
+        path = []
+        while distance:
+            for next_state, source, destination in engine.iter_successors(state):
+                if self.distances[rank_situation(next_state, self.num_disks)] == distance - 1:
+                    path.append(engine.moves[source][destination])
+                    state = next_state
+                    distance -= 1
+                    break
+        return path
+
+    def solve_batch(self, situations: Iterable[Any]) -> Iterator[Optional[List[Tuple[str, str]]]]:
+        """Решить пакет начальных состояний, по одному списку ходов на каждое."""
+        for situation in situations:
+            yield self.get_path(situation)
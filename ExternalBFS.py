@@ -0,0 +1,236 @@
+"""
+ExternalBFS.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Поиск в ширину во внешней памяти для пространств состояний больше ОЗУ.
+Каждый уровень глубины хранится на диске как отсортированный файл упакованных состояний (uint64).
+Дети уровня копятся в буфере ограниченного размера, который сортируется и сбрасывается
+на диск отдельным прогоном. Затем прогоны сливаются потоково, а повторы убираются
+слиянием с двумя предыдущими уровнями (граф ходов неориентированный, больше сравнивать не с чем).
+Результат - число состояний на каждой глубине и, при заданной цели, путь до неё,
+восстановленный обратным просмотром уровней.
+"""
+
+import heapq
+import os
+import shutil
+import tempfile
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from PackedState import ROD_NAMES, get_engine
+
+STATE_SIZE = array('Q').itemsize
+
+
+class ExternalBFSConfig:
+    """Параметры внешнего поиска."""
+
+    def __init__(self, work_dir: Optional[str] = None, buffer_states: int = 1 << 20, read_states: int = 1 << 16,
+                 keep_files: bool = False):
+        """
+        Args:
+            work_dir: Каталог для файлов уровней (по умолчанию - временный).
+            buffer_states: Сколько детей копится в памяти перед сбросом прогона на диск.
+            read_states: Размер блока чтения одного файла при слиянии.
+            keep_files: Не удалять файлы уровней после завершения.
+        """
+        self.work_dir = work_dir
+        self.buffer_states = buffer_states
+        self.read_states = read_states
+        self.keep_files = keep_files
+
+
+def _read_states(path: str, block: int) -> Iterator[int]:
+    """Потоково читать состояния из файла блоками."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = array('Q')
+            data = f.read(block * STATE_SIZE)
+            if not data:
+                return
+            chunk.frombytes(data)
+            yield from chunk
+
+
+def _unique(states: Iterable[int]) -> Iterator[int]:
+    """Убрать подряд идущие повторы отсортированного потока."""
+    previous = None
+    for state in states:
+        if state != previous:
+            yield state
+            previous = state
+
+
+def _difference(states: Iterator[int], *excluded: Iterator[int]) -> Iterator[int]:
+    """Отсортированный поток states без элементов отсортированных потоков excluded."""
+    merged_excluded = _unique(heapq.merge(*excluded))
+    current = next(merged_excluded, None)
+    for state in states:
+        while current is not None and current < state:
+            current = next(merged_excluded, None)
+        if current != state:
+            yield state
+
+
+def _write_states(path: str, states: Iterable[int], block: int) -> int:
+    """Записать поток состояний блоками; вернуть их количество."""
+    count = 0
+    chunk = array('Q')
+    with open(path, 'wb') as f:
+        for state in states:
+            chunk.append(state)
+            if len(chunk) >= block:
+                chunk.tofile(f)
+                count += len(chunk)
+                chunk = array('Q')
+        chunk.tofile(f)
+        count += len(chunk)
+    return count
+
+
+def _contains(path: str, state: int) -> bool:
+    """Двоичный поиск состояния в отсортированном файле уровня."""
+    with open(path, 'rb') as f:
+        low, high = 0, os.path.getsize(path) // STATE_SIZE
+        while low < high:
+            middle = (low + high) // 2
+            f.seek(middle * STATE_SIZE)
+            value = array('Q')
+            value.frombytes(f.read(STATE_SIZE))
+            if value[0] < state:
+                low = middle + 1
+            else:
+                high = middle
+        if low * STATE_SIZE >= os.path.getsize(path):
+            return False
+        f.seek(low * STATE_SIZE)
+        value = array('Q')
+        value.frombytes(f.read(STATE_SIZE))
+        return value[0] == state
+
+
+class ExternalBFS:
+    """Поиск в ширину с уровнями на диске."""
+
+    def __init__(self, num_disks: int, config: Optional[ExternalBFSConfig] = None,
+                 rod_names: Tuple[str, ...] = ROD_NAMES):
+        self.num_disks = num_disks
+        self.engine = get_engine(num_disks, rod_names)
+        if self.engine.bits_per_disk * num_disks > 8 * STATE_SIZE:
+            raise ValueError(f"Состояние из {num_disks} дисков на {self.engine.num_rods} стержнях "
+                             f"не помещается в {8 * STATE_SIZE} бит.")
+        self.config = config or ExternalBFSConfig()
+
+    def _layer_path(self, work_dir: str, depth: int) -> str:
+        return os.path.join(work_dir, f"layer_{depth:06d}.bin")
+
+    def _expand(self, work_dir: str, depth: int, progress: Optional[Callable[[int, int, int, int], None]] = None,
+                accepted: int = 0, frontier: int = 0) -> List[str]:
+        """
+        Раскрыть уровень: дети сортируются в буфере и сбрасываются прогонами.
+        progress вызывается каждые config.read_states раскрытых состояний (см. run).
+        """
+        config = self.config
+        runs = []
+        buffer = []
+        expanded = generated = 0
+
+        def flush() -> None:
+            run_path = os.path.join(work_dir, f"run_{depth + 1:06d}_{len(runs):06d}.bin")
+            buffer.sort()
+            _write_states(run_path, _unique(buffer), config.read_states)
+            runs.append(run_path)
+            buffer.clear()
+
+        for state in _read_states(self._layer_path(work_dir, depth), config.read_states):
+            before = len(buffer)
+            for next_state, _, _ in self.engine.iter_successors(state):
+                buffer.append(next_state)
+            generated += len(buffer) - before
+            expanded += 1
+            if progress is not None and expanded == config.read_states:
+                progress(expanded, generated, accepted, frontier)
+                expanded = generated = 0
+            if len(buffer) >= config.buffer_states:
+                flush()
+        if buffer:
+            flush()
+        if progress is not None and expanded:
+            progress(expanded, generated, accepted, frontier)
+        return runs
+
+    def run(self, start: int, goal: Optional[int] = None, max_depth: Optional[int] = None,
+            progress: Optional[Callable[[int, int, int, int], None]] = None) -> \
+            Tuple[List[int], Optional[List[Tuple[str, str]]]]:
+        """
+        Выполнить поиск.
+        Args:
+            start: Начальное упакованное состояние.
+            goal: Цель (None - обойти всё достижимое пространство).
+            max_depth: Максимальная глубина.
+            progress: Функция (раскрыто, сгенерировано, принято всего, размер уровня), вызываемая
+                по ходу раскрытия; исключение из неё прерывает поиск (файлы при этом удаляются).
+        Returns:
+            (число состояний на каждой глубине, путь до цели или None)
+        """
+        config = self.config
+        work_dir = config.work_dir or tempfile.mkdtemp(prefix='hanoi_bfs_')
+        os.makedirs(work_dir, exist_ok=True)
+        block = config.read_states
+        try:
+            _write_states(self._layer_path(work_dir, 0), [start], block)
+            counts = [1]
+            if goal == start:
+                return counts, []
+
+            depth = 0
+            while max_depth is None or depth < max_depth:
+                runs = self._expand(work_dir, depth, progress, sum(counts) - 1, counts[depth])
+                previous = [self._layer_path(work_dir, d) for d in (depth, depth - 1) if d >= 0]
+                merged = _unique(heapq.merge(*(_read_states(run, block) for run in runs)))
+                fresh = _difference(merged, *(_read_states(path, block) for path in previous))
+                count = _write_states(self._layer_path(work_dir, depth + 1), fresh, block)
+                for run in runs:
+                    os.remove(run)
+                if not count:
+                    os.remove(self._layer_path(work_dir, depth + 1))
+                    break
+
+                depth += 1
+                counts.append(count)
+                # Без цели старые уровни больше не нужны
+                if goal is None and depth >= 2 and not config.keep_files:
+                    os.remove(self._layer_path(work_dir, depth - 2))
+                if goal is not None and _contains(self._layer_path(work_dir, depth), goal):
+                    return counts, self._rebuild_path(work_dir, goal, depth)
+            return counts, None
+        finally:
+            if not config.keep_files and config.work_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            elif not config.keep_files:
+                self._cleanup(work_dir)
+
+    def _cleanup(self, work_dir: str) -> None:
+        """Удалить файлы уровней и прогонов из заданного пользователем каталога."""
+        for name in os.listdir(work_dir):
+            if name.startswith(('layer_', 'run_')) and name.endswith('.bin'):
+                os.remove(os.path.join(work_dir, name))
+
+    def _rebuild_path(self, work_dir: str, goal: int, depth: int) -> List[Tuple[str, str]]:
+        """Обратный просмотр уровней: для состояния глубины d ищем соседа на глубине d - 1."""
+        path = []
+        state = goal
+        for level in range(depth - 1, -1, -1):
+            layer = self._layer_path(work_dir, level)
+            for previous_state, source, destination in self.engine.iter_successors(state):
+                if _contains(layer, previous_state):
+                    # Из previous_state в state ведёт обратный ход
+                    path.append(self.engine.moves[destination][source])
+                    state = previous_state
+                    break
+        return path[::-1]
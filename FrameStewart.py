@@ -0,0 +1,133 @@
+"""
+FrameStewart.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Планировщик для Ханойской башни с k стержнями по алгоритму Фрейма - Стюарта.
+FS(n, k) = min по t из 2 * FS(t, k) + FS(n - t, k - 1): верхние t дисков уходят на промежуточный стержень,
+оставшиеся n - t переносятся без него, затем t дисков ложатся сверху.
+Точка разбиения t запоминается в LRU-кеше по ключу (n, k), поэтому число ходов
+считается без генерации самих ходов. Для произвольных конфигураций планировщик
+передаёт задачу стратегиям поиска Solver.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from HanoiTower import get_next_situations
+from PackedState import rod_names_for
+from Solver import Solver
+
+INFINITY = float('inf')
+
+
+@lru_cache(maxsize=None)
+def _frame_stewart(num_disks: int, num_rods: int) -> Tuple[float, int]:
+    """(минимальное число ходов, число дисков t в верхней части) для n дисков и k стержней."""
+    if num_disks == 0:
+        return 0, 0
+    if num_disks == 1:
+        return 1, 0
+    if num_rods < 3:
+        return INFINITY, 0
+    if num_rods == 3:
+        return 2 ** num_disks - 1, num_disks - 1
+    best, best_split = INFINITY, 0
+    for split in range(1, num_disks):
+        moves = 2 * _frame_stewart(split, num_rods)[0] + _frame_stewart(num_disks - split, num_rods - 1)[0]
+        if moves < best:
+            best, best_split = moves, split
+    return best, best_split
+
+
+def frame_stewart(num_disks: int, num_rods: int) -> Tuple[int, int]:
+    """
+    Число ходов и точка разбиения по Фрейму - Стюарту.
+    Таблица заполняется снизу вверх, чтобы рекурсия не упиралась в глубину стека.
+    """
+    for rods in range(3, num_rods + 1):
+        for disks in range(num_disks + 1):
+            _frame_stewart(disks, rods)
+    moves, split = _frame_stewart(num_disks, num_rods)
+    return int(moves), split
+
+
+def frame_stewart_moves(num_disks: int, source: str, target: str, rods: Tuple[str, ...]) -> Iterator[Tuple[str, str]]:
+    """Перенести башню из num_disks верхних дисков с source на target, используя стержни rods."""
+    frame_stewart(num_disks, len(rods))  # Таблица заполняется один раз на всё решение
+    # splits[k][n] - точка разбиения для n дисков и k стержней (подзадачи берут её без пересчёта)
+    splits = {num_rods: [_frame_stewart(disks, num_rods)[1] for disks in range(num_disks + 1)]
+              for num_rods in range(3, len(rods) + 1)}
+    return _frame_stewart_moves(num_disks, source, target, rods, splits)
+
+
+def _frame_stewart_moves(num_disks: int, source: str, target: str, rods: Tuple[str, ...],
+                         splits: Dict[int, List[int]]) -> Iterator[Tuple[str, str]]:
+    if num_disks == 0:
+        return
+    if num_disks == 1:
+        yield source, target
+        return
+    split = splits[len(rods)][num_disks]
+    intermediate = next(rod for rod in rods if rod != source and rod != target)
+    remaining_rods = tuple(rod for rod in rods if rod != intermediate)
+    yield from _frame_stewart_moves(split, source, intermediate, rods, splits)
+    yield from _frame_stewart_moves(num_disks - split, source, target, remaining_rods, splits)
+    yield from _frame_stewart_moves(split, intermediate, target, rods, splits)
+
+
+class FrameStewartPlanner:
+    """Планировщик: Фрейм - Стюарт для башни с одного стержня на другой, иначе - поиск Solver."""
+
+    def __init__(self, num_disks: int, num_rods: int = 3, strategy: str = 'solve_wide',
+                 solver: Optional[Solver] = None):
+        """
+        Args:
+            num_disks: Количество дисков.
+            num_rods: Количество стержней.
+            strategy: Имя метода Solver для произвольных конфигураций.
+            solver: Готовый решатель (по умолчанию - с глубиной 2 * FS(n, k)).
+        """
+        self.num_disks = num_disks
+        self.num_rods = num_rods
+        self.rod_names = rod_names_for(num_rods)
+        self.strategy = strategy
+        self.solver = solver or Solver(max_depth=2 * frame_stewart(num_disks, num_rods)[0], num_disks=num_disks,
+                                       num_rods=num_rods)
+
+    def _tower_rods(self, current_situation: Any, goal_situation: Any) -> Optional[Tuple[str, str]]:
+        """Если обе ситуации - полные башни на разных стержнях, вернуть (source, target)."""
+        rods = []
+        for situation in (current_situation, goal_situation):
+            full = [idx for idx, disks in enumerate(situation) if len(disks) == self.num_disks]
+            if not full:
+                return None
+            rods.append(self.rod_names[full[0]])
+        return (rods[0], rods[1]) if rods[0] != rods[1] else None
+
+    def count(self, current_situation: Any, goal_situation: Any) -> Optional[int]:
+        """Число ходов; для стандартной задачи - без генерации ходов."""
+        if current_situation == goal_situation:
+            return 0
+        if self._tower_rods(current_situation, goal_situation):
+            return frame_stewart(self.num_disks, self.num_rods)[0]
+        moves = self.plan(current_situation, goal_situation)
+        return None if moves is None else len(moves)
+
+    def plan(self, current_situation: Any, goal_situation: Any) -> Optional[Any]:
+        """
+        Построить решение.
+        Returns:
+            Генератор ходов для стандартной задачи, список ходов от Solver для остальных или None.
+        """
+        if current_situation == goal_situation:
+            return []
+        tower_rods = self._tower_rods(current_situation, goal_situation)
+        if tower_rods:
+            return frame_stewart_moves(self.num_disks, tower_rods[0], tower_rods[1], self.rod_names)
+        search = getattr(self.solver, self.strategy)
+        moves: Optional[List[Tuple[str, str]]] = search(current_situation, goal_situation, get_next_situations)
+        return moves
@@ -9,18 +9,37 @@ HanoiTower.py
 Модуль, реализующий логику игры Ханойская башня
 """
 
-from typing import Union, Dict, List, Tuple
+from array import array
+from typing import Union, Dict, List, Tuple, Iterable, Optional, Callable
 from Rod import Rod
+from MoveCodec import PackedMoves
+from PackedState import rod_names_for
 
 
-def score_situation(situation: Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]], num_disks: int) -> float:
+class IllegalMoveError(ValueError):
+    """Недопустимый ход при воспроизведении решения."""
+
+    def __init__(self, index: int, move: Tuple[str, str], reason: str) -> None:
+        """
+        Args:
+            index: Номер хода в последовательности (с нуля).
+            move: Сам ход (source, destination).
+            reason: Причина.
+        """
+        self.index = index
+        self.move = move
+        self.reason = reason
+        super().__init__(f"Ход #{index} {move[0]} -> {move[1]}: {reason}")
+
+
+def score_situation(situation: Tuple[Tuple[int, ...], ...], num_disks: int) -> float:
     """
     Оценить состояние: меньший счёт = лучшее состояние.
     Критерии:
-    - Количество дисков на стержне C, в правильном порядке (больше = лучше).
-    - Количество дисков на A и B (меньше = лучше).
+    - Количество дисков на последнем стержне (C для трёх стержней), в правильном порядке (больше = лучше).
+    - Количество дисков на остальных стержнях (меньше = лучше).
     """
-    rod_a, rod_b, rod_c = situation
+    *other_rods, rod_c = situation
     score = 0.0
 
     target_c = tuple(range(num_disks, 0, -1))
@@ -30,63 +49,141 @@ def score_situation(situation: Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int
             correct_disks += 1
     score -= 10 * correct_disks
 
-    score += 5 * (len(rod_a) + len(rod_b))
+    score += 5 * sum(len(rod) for rod in other_rods)
 
     return score
 
 
-def get_next_situations(situation: Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]], num_disks: int,
-                        gradient: bool = False) -> List[
-    Tuple[Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]], Tuple[str, str]]]:
-    """Генерировать возможные следующие состояния и соответствующие ходы."""
-    rod_names = ['A', 'B', 'C']
-    rods = {name: list(disks) for name, disks in zip(rod_names, situation)}  # Временные списки для симуляции
+def target_counts(situation: Tuple[Tuple[int, ...], ...], num_disks: int) -> Tuple[int, int]:
+    """
+    Счётчики, из которых складываются score_situation и Solver._heuristic:
+    (сколько дисков правильно уложено на последнем стержне снизу, сколько всего дисков на нём).
+    """
+    rod = situation[-1]
+    correct = 0
+    for disk in rod:
+        if disk != num_disks - correct:
+            break
+        correct += 1
+    return correct, len(rod)
 
+
+def child_counts(counts: Tuple[int, int], disk: int, source_idx: int, destination_idx: int,
+                 num_disks: int, num_rods: int) -> Tuple[int, int]:
+    """Счётчики target_counts после хода диска disk, по счётчикам до хода, за O(1)."""
+    correct, on_target = counts
+    target_rod = num_rods - 1
+    if destination_idx == target_rod:
+        on_target += 1
+        # Цепочка растёт, только если лёг следующий по размеру недостающий диск
+        if disk == num_disks - correct:
+            correct += 1
+    elif source_idx == target_rod:
+        on_target -= 1
+        if correct and disk == num_disks - correct + 1:
+            correct -= 1
+    return correct, on_target
+
+
+def scored_successors(situation: Tuple[Tuple[int, ...], ...], num_disks: int, gradient: bool = False,
+                      counts: Optional[Tuple[int, int]] = None) -> \
+        List[Tuple[Tuple[Tuple[int, ...], ...], Tuple[str, str], Tuple[int, int]]]:
+    """
+    Преемники вместе со счётчиками target_counts, полученными приращением от счётчиков родителя.
+    При gradient=True порядок тот же, что у сортировки по score_situation по убыванию, но без сортировки:
+    ход меняет счёт лишь на одно из пяти значений, и преемники раскладываются по пяти корзинам.
+    Args:
+        situation: Текущее состояние.
+        num_disks: Количество дисков.
+        gradient: Упорядочить по оценке.
+        counts: Счётчики самого situation, если уже известны (иначе считаются заново).
+    Returns:
+        Список (next_situation, move, (correct, on_target)).
+    """
+    if counts is None:
+        counts = target_counts(situation, num_disks)
+    num_rods = len(situation)
+    rod_names = rod_names_for(num_rods)
+    buckets = [[], [], [], [], []] if gradient else None
     next_situations = []
-    for source_idx, source in enumerate(rod_names):
-        if not rods[source]:
+    for source_idx, source_disks in enumerate(situation):
+        if not source_disks:
             continue
-        disk = rods[source][-1]  # Верхний диск
-        for dest_idx, dest in enumerate(rod_names):
-            if source == dest:
+        disk = source_disks[-1]
+        rest = source_disks[:-1]
+        for dest_idx, dest_disks in enumerate(situation):
+            if dest_idx == source_idx or (dest_disks and dest_disks[-1] < disk):
                 continue
-            if not rods[dest] or rods[dest][-1] > disk:  # Можно перемещать только на больший диск или пустой
-                # Симулировать ход
-                new_rods = {k: v[:] for k, v in rods.items()}
-                new_rods[source].pop()
-                new_rods[dest].append(disk)
-                new_situation = (
-                    tuple(new_rods['A']),
-                    tuple(new_rods['B']),
-                    tuple(new_rods['C'])
-                )
-                next_situations.append((new_situation, (source, dest)))
-
+            new_situation = list(situation)
+            new_situation[source_idx] = rest
+            new_situation[dest_idx] = dest_disks + (disk,)
+            next_counts = child_counts(counts, disk, source_idx, dest_idx, num_disks, num_rods)
+            item = (tuple(new_situation), (rod_names[source_idx], rod_names[dest_idx]), next_counts)
+            if gradient:
+                # Приращение счёта -10 * dc - 5 * do; корзина 0 - наибольшее (+15), 4 - наименьшее (-15)
+                buckets[2 + next_counts[0] - counts[0] + next_counts[1] - counts[1]].append(item)
+            else:
+                next_situations.append(item)
     if gradient:
-        next_situations.sort(key=lambda x: score_situation(x[0], num_disks), reverse=True)
+        for bucket in buckets:
+            next_situations += bucket
+    return next_situations
+
 
+def get_next_situations(situation: Tuple[Tuple[int, ...], ...], num_disks: int,
+                        gradient: bool = False) -> List[Tuple[Tuple[Tuple[int, ...], ...], Tuple[str, str]]]:
+    """
+    Генерировать возможные следующие состояния и соответствующие ходы.
+    Работает прямо с кортежами (без упаковки в число); число стержней берётся из самой ситуации,
+    num_disks нужен только для упорядочивания по score_situation (gradient, см. scored_successors).
+    Для упакованных состояний см. PackedHanoi.get_next_situations.
+    """
+    if gradient:
+        return [(next_situation, move) for next_situation, move, _ in scored_successors(situation, num_disks, True)]
+    rod_names = rod_names_for(len(situation))
+    next_situations = []
+    for source_idx, source_disks in enumerate(situation):
+        if not source_disks:
+            continue
+        disk = source_disks[-1]  # Верхний диск
+        rest = source_disks[:-1]
+        for dest_idx, dest_disks in enumerate(situation):
+            if dest_idx == source_idx:
+                continue
+            if not dest_disks or dest_disks[-1] > disk:  # Можно перемещать только на больший диск или пустой
+                new_situation = list(situation)
+                new_situation[source_idx] = rest
+                new_situation[dest_idx] = dest_disks + (disk,)
+                next_situations.append((tuple(new_situation), (rod_names[source_idx], rod_names[dest_idx])))
     return next_situations
 
 
 class HanoiTower:
     """Класс, реализующий игру Ханойские башни."""
 
-    def __init__(self, num_disks_or_rods: Union[int, Dict[str, Rod]]) -> None:
+    @classmethod
+    def from_situation(cls, situation: Tuple[Tuple[int, ...], ...]) -> 'HanoiTower':
+        """Создать игру по ситуации - кортежу кортежей дисков (A, B, C, ...)."""
+        rods = {}
+        for name, disks in zip(rod_names_for(len(situation)), situation):
+            rods[name] = Rod(name)
+            for disk in disks:
+                rods[name].push(disk)
+        return cls(rods)
+
+    def __init__(self, num_disks_or_rods: Union[int, Dict[str, Rod]], num_rods: int = 3) -> None:
         """
         Инициализация игры Ханойские башни.
         Args:
             num_disks_or_rods: Либо количество дисков (int), либо словарь со стержнями (Dict[str, Rod]).
+            num_rods: Количество стержней, если задано число дисков (A, B, C, D, ...).
         """
         self.move_count: int = 0  # Счётчик шагов
 
         if isinstance(num_disks_or_rods, int):
             # Первый случай: инициализация с числом дисков
             self.num_disks: int = num_disks_or_rods
-            self.rods: Dict[str, Rod] = {
-                'A': Rod('A'),
-                'B': Rod('B'),
-                'C': Rod('C')
-            }
+            self.rods: Dict[str, Rod] = {name: Rod(name) for name in rod_names_for(num_rods)}
             # Инициализация начального стержня A с дисками
             for disk in range(self.num_disks, 0, -1):
                 self.rods['A'].push(disk)
@@ -97,12 +194,10 @@ class HanoiTower:
         else:
             raise TypeError("Аргумент должен быть либо int, либо Dict[str, Rod]")
 
-        # Целевая ситуация: все диски на стержне C в порядке [num_disks, ..., 1]
-        self.target_situation: Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]] = (
-            (),  # A пусто
-            (),  # B пусто
-            tuple(range(self.num_disks, 0, -1))  # C: [n, n-1, ..., 1]
-        )
+        # Целевая ситуация: все диски на последнем стержне (C) в порядке [num_disks, ..., 1],
+        # остальные стержни пусты
+        self.target_situation: Tuple[Tuple[int, ...], ...] = \
+            ((),) * (len(self.rods) - 1) + (tuple(range(self.num_disks, 0, -1)),)
 
         # Проверка начальной ситуации
         self.validate_initial_situation()
@@ -156,6 +251,51 @@ class HanoiTower:
             print(rod)
         print("-" * 30)
 
+    def replay(self, moves: Union[Iterable[Tuple[str, str]], bytes, bytearray, memoryview],
+               progress: Optional[Callable[[int], None]] = None, progress_every: int = 1 << 16) -> int:
+        """
+        Применить последовательность ходов без вывода на экран.
+        Ходы проверяются в плотном цикле по массивам дисков; при недопустимом ходе
+        игра остаётся в состоянии перед ним и выбрасывается IllegalMoveError с его номером.
+        Args:
+            moves: Список, генератор, PackedMoves или упакованный буфер (bytes) ходов (source, destination).
+            progress: Функция, вызываемая с числом применённых ходов каждые progress_every ходов.
+            progress_every: Период вызова progress.
+        Returns:
+            Количество применённых ходов.
+        """
+        if isinstance(moves, (bytes, bytearray, memoryview)):
+            moves = PackedMoves.from_bytes(moves)
+
+        rods = {name: array('I', rod.disks) for name, rod in self.rods.items()}
+        applied = 0
+        try:
+            for source, destination in moves:
+                source_disks = rods.get(source)
+                destination_disks = rods.get(destination)
+                if source_disks is None or destination_disks is None:
+                    raise IllegalMoveError(applied, (source, destination), "неизвестный стержень")
+                if not source_disks:
+                    raise IllegalMoveError(applied, (source, destination), f"стержень {source} пуст")
+                disk = source_disks[-1]
+                if destination_disks and destination_disks[-1] < disk:
+                    raise IllegalMoveError(
+                        applied, (source, destination),
+                        f"нельзя положить диск {disk} на меньший диск {destination_disks[-1]}")
+                destination_disks.append(source_disks.pop())
+                applied += 1
+                if progress is not None and applied % progress_every == 0:
+                    progress(applied)
+        finally:
+            for name, rod in self.rods.items():
+                rod.disks = list(rods[name])
+            self.move_count += applied
+        return applied
+
+    def snapshot(self) -> str:
+        """Текстовый снимок текущего состояния стержней (то же, что печатает print_situation)."""
+        return "\n".join(str(rod) for rod in self.rods.values()) + "\n" + "-" * 30
+
     def get_move_count(self) -> int:
         """Вернуть общее количество шагов."""
         return self.move_count
@@ -164,10 +304,6 @@ class HanoiTower:
         """Проверить, достигнута ли целевая ситуация."""
         return self.get_situation() == self.target_situation
 
-    def get_situation(self) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
-        """Получить текущее состояние как кортеж кортежей дисков (A, B, C)."""
-        return (
-            tuple(self.rods['A'].disks),
-            tuple(self.rods['B'].disks),
-            tuple(self.rods['C'].disks)
-        )
+    def get_situation(self) -> Tuple[Tuple[int, ...], ...]:
+        """Получить текущее состояние как кортеж кортежей дисков (A, B, C, ...)."""
+        return tuple(tuple(rod.disks) for rod in self.rods.values())
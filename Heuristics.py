@@ -0,0 +1,111 @@
+"""
+Heuristics.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Эвристики для стратегии ветвей и границ (A*).
+Эвристика - это объект с методом estimate(situation, goal_situation),
+который можно подменять в Solver без изменения самого поиска.
+Состояния принимаются как кортежи кортежей (A, B, C) или как упакованные числа PackedHanoi.
+"""
+
+from typing import Any, List, Sequence
+
+from PackedState import get_engine, rod_names_for
+
+
+def situation_to_positions(situation: Any, num_disks: int, num_rods: int = 3) -> List[int]:
+    """
+    Перевести состояние в список позиций: positions[d] - индекс стержня диска d (positions[0] не используется).
+    num_rods нужен только для упакованных чисел (от него зависит ширина поля диска).
+    """
+    if isinstance(situation, int):
+        engine = get_engine(num_disks, rod_names_for(num_rods))
+        return [0] + [engine.rod_of(situation, disk) for disk in range(1, num_disks + 1)]
+    positions = [0] * (num_disks + 1)
+    for rod_idx, disks in enumerate(situation):
+        for disk in disks:
+            positions[disk] = rod_idx
+    return positions
+
+
+def check_three_rods(*situations: Any) -> None:
+    """Формулы ниже верны только для трёх стержней: отказать для кортежей с другим числом стержней."""
+    for situation in situations:
+        if not isinstance(situation, int) and len(situation) != 3:
+            raise ValueError(f"Точное расстояние считается только для трёх стержней, а не {len(situation)}.")
+
+
+def tower_distance(positions: Sequence[int], top_disk: int, rod_idx: int) -> int:
+    """
+    Точное число ходов, чтобы собрать диски 1..top_disk в башню на стержне rod_idx.
+    Рекурсия по наибольшему диску, развёрнутая в цикл: O(n).
+    """
+    distance = 0
+    target = rod_idx
+    for disk in range(top_disk, 0, -1):
+        if positions[disk] != target:
+            # Меньшие диски сначала уходят на третий стержень, затем диск перекладывается,
+            # после чего меньшая башня (2^(disk-1) - 1 ходов) ложится сверху
+            distance += 1 << (disk - 1)
+            target = 3 - target - positions[disk]
+    return distance
+
+
+def exact_distance(start: Sequence[int], goal: Sequence[int], num_disks: int) -> int:
+    """
+    Точное оптимальное расстояние между двумя допустимыми конфигурациями (три стержня).
+    Пока наибольшие диски совпадают, они не двигаются. Первый несовпавший диск
+    перекладывается либо один раз (через третий стержень), либо дважды - берётся минимум.
+    """
+    disk = num_disks
+    while disk > 0 and start[disk] == goal[disk]:
+        disk -= 1
+    if disk == 0:
+        return 0
+
+    source, destination = start[disk], goal[disk]
+    auxiliary = 3 - source - destination
+    smaller = disk - 1
+
+    # Один ход наибольшего диска: source -> destination
+    one_move = tower_distance(start, smaller, auxiliary) + 1 + tower_distance(goal, smaller, auxiliary)
+    # Два хода: source -> auxiliary -> destination, меньшая башня переносится целиком между ними
+    two_moves = (tower_distance(start, smaller, destination) + 1 + ((1 << smaller) - 1) + 1
+                 + tower_distance(goal, smaller, source))
+    return min(one_move, two_moves)
+
+
+class Heuristic:
+    """Базовый интерфейс эвристики: меньше = ближе к цели."""
+
+    def estimate(self, situation: Any, goal_situation: Any) -> float:
+        """Оценить расстояние от situation до goal_situation."""
+        raise NotImplementedError
+
+
+class ExactDistanceHeuristic(Heuristic):
+    """
+    Точное расстояние до цели для классической задачи с тремя стержнями.
+    Допустима и согласована, поэтому A* с ней идёт по оптимальному пути без лишних раскрытий.
+    """
+
+    def __init__(self, num_disks: int):
+        self.num_disks = num_disks
+        self._goal_situation = None
+        self._goal_positions: List[int] = []
+
+    def _goal(self, goal_situation: Any) -> List[int]:
+        """Позиции дисков цели (кешируются, пока цель не меняется)."""
+        if goal_situation != self._goal_situation:
+            check_three_rods(goal_situation)
+            self._goal_situation = goal_situation
+            self._goal_positions = situation_to_positions(goal_situation, self.num_disks)
+        return self._goal_positions
+
+    def estimate(self, situation: Any, goal_situation: Any) -> float:
+        return exact_distance(situation_to_positions(situation, self.num_disks),
+                              self._goal(goal_situation), self.num_disks)
@@ -0,0 +1,152 @@
+"""
+LoadTest.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Нагрузочный тест SolverService.
+На каждом уровне параллельности запускается столько клиентов, каждый в своём соединении
+отправляет запросы по одному (следующий - после ответа на предыдущий).
+Задачи берутся из небольшого набора (одинаковые запросы объединяются сервисом),
+с --unique каждый запрос уникален. Выводятся пропускная способность и задержки p50 / p99.
+
+Запуск:
+    python LoadTest.py --spawn --concurrency 1 4 16 64 --requests 400
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Перцентиль по ближайшему рангу."""
+    ordered = sorted(values)
+    if not ordered:
+        return float('nan')
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def make_specs(min_disks: int, max_disks: int, seed: int) -> List[Dict[str, Any]]:
+    """Набор задач: стандартная башня и по две случайные конфигурации на каждое n."""
+    rng = random.Random(seed)
+    specs = []
+    for num_disks in range(min_disks, max_disks + 1):
+        specs.append({'disks': num_disks})
+        for _ in range(2):
+            rods: List[List[int]] = [[], [], []]
+            for disk in range(num_disks, 0, -1):
+                rods[rng.randrange(3)].append(disk)
+            specs.append({'disks': num_disks, 'rods': rods})
+    return specs
+
+
+async def _client(host: str, port: int, specs: List[Dict[str, Any]], counter: itertools.count, total: int,
+                  unique: bool, deadline: Optional[float], results: List[Dict[str, Any]]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random()
+    try:
+        while True:
+            number = next(counter)
+            if number >= total:
+                break
+            spec = dict(rng.choice(specs), id=number)
+            if unique:
+                spec['nonce'] = number
+            if deadline is not None:
+                spec['deadline'] = deadline
+            started = time.perf_counter()
+            writer.write((json.dumps(spec) + '\n').encode())
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            results.append(dict(latency=time.perf_counter() - started, error=response.get('error'),
+                                shared=response.get('shared', False)))
+    finally:
+        writer.close()
+
+
+async def run_level(host: str, port: int, concurrency: int, total: int, specs: List[Dict[str, Any]],
+                    unique: bool, deadline: Optional[float]) -> Dict[str, Any]:
+    """Один уровень параллельности."""
+    results: List[Dict[str, Any]] = []
+    counter = itertools.count()
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, specs, counter, total, unique, deadline, results)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies = [r['latency'] for r in results if r['error'] is None]
+    return dict(concurrency=concurrency, requests=len(results), errors=sum(r['error'] is not None for r in results),
+                shared=sum(bool(r['shared']) for r in results), throughput=len(results) / elapsed,
+                p50_ms=percentile(latencies, 0.50) * 1000, p99_ms=percentile(latencies, 0.99) * 1000)
+
+
+async def _wait_for_server(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    specs = make_specs(args.min_disks, args.max_disks, args.seed)
+    await _wait_for_server(args.host, args.port)
+    reports = []
+    print(f"{'клиентов':>9} {'запросов':>9} {'ошибок':>7} {'общих':>6} {'запр/с':>9} {'p50, мс':>9} {'p99, мс':>9}")
+    for concurrency in args.concurrency:
+        report = await run_level(args.host, args.port, concurrency, args.requests, specs, args.unique, args.deadline)
+        reports.append(report)
+        print(f"{report['concurrency']:9d} {report['requests']:9d} {report['errors']:7d} {report['shared']:6d} "
+              f"{report['throughput']:9.1f} {report['p50_ms']:9.2f} {report['p99_ms']:9.2f}")
+    return reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест SolverService")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=400, help="Запросов на уровень")
+    parser.add_argument('--min-disks', type=int, default=3)
+    parser.add_argument('--max-disks', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--unique', action='store_true', help="Не давать сервису объединять запросы")
+    parser.add_argument('--deadline', type=float, help="Срок ответа на запрос, с")
+    parser.add_argument('--spawn', action='store_true', help="Запустить сервис в отдельном процессе")
+    parser.add_argument('--workers', type=int, help="Число процессов сервиса (с --spawn)")
+    parser.add_argument('--json', help="Сохранить результаты в файл JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        command = [sys.executable, 'SolverService.py', '--host', args.host, '--port', str(args.port)]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+        server = subprocess.Popen(command, cwd=sys.path[0] or None, stdout=subprocess.DEVNULL)
+    try:
+        reports = asyncio.run(main_async(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(reports, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
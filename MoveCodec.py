@@ -0,0 +1,129 @@
+"""
+MoveCodec.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Компактный двоичный формат последовательности ходов (три стержня).
+Ход - одна из 6 пар стержней, кодируется 3 битами: 8 ходов занимают ровно 3 байта.
+Перед данными идёт короткий заголовок (сигнатура, версия, число ходов).
+PackedMoves читается без копирования через memoryview, срез возвращает
+представление над тем же буфером, а итерация выдаёт обычные кортежи (source, destination),
+поэтому упакованное решение можно передавать туда же, куда и список ходов.
+"""
+
+import struct
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from PackedState import ROD_NAMES
+
+MAGIC = b'HMV'
+HEADER = struct.Struct('<3sBQ')  # magic, version, число ходов
+VERSION = 1
+BITS_PER_MOVE = 3
+MOVES_PER_GROUP = 8  # 8 ходов * 3 бита = 3 байта
+GROUP_SIZE = 3
+
+# Код хода -> (source, destination) в порядке PackedHanoi.pairs
+MOVES = tuple((source, destination) for source in ROD_NAMES for destination in ROD_NAMES if source != destination)
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+
+def encode_moves(moves: Iterable[Tuple[str, str]]) -> 'PackedMoves':
+    """Упаковать последовательность ходов (список, генератор, SolutionStream)."""
+    payload = bytearray()
+    codes = MOVE_CODES
+    group = 0
+    shift = 0
+    count = 0
+    for move in moves:
+        group |= codes[move] << shift
+        shift += BITS_PER_MOVE
+        count += 1
+        if shift == BITS_PER_MOVE * MOVES_PER_GROUP:
+            payload += group.to_bytes(GROUP_SIZE, 'little')
+            group = shift = 0
+    if shift:
+        payload += group.to_bytes(GROUP_SIZE, 'little')
+    return PackedMoves(memoryview(payload), 0, count)
+
+
+def decode_moves(data: Union[bytes, bytearray, memoryview]) -> List[Tuple[str, str]]:
+    """Распаковать буфер с заголовком в список ходов."""
+    return list(PackedMoves.from_bytes(data))
+
+
+class PackedMoves:
+    """Упакованная последовательность ходов (представление над буфером без копирования)."""
+
+    def __init__(self, payload: memoryview, start: int, count: int):
+        """
+        Args:
+            payload: Данные без заголовка.
+            start: Номер первого хода представления в payload.
+            count: Количество ходов.
+        """
+        self.payload = payload
+        self.start = start
+        self.count = count
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> 'PackedMoves':
+        """Разобрать буфер с заголовком; данные не копируются."""
+        view = memoryview(data)
+        magic, version, count = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Буфер не является последовательностью ходов версии {VERSION}.")
+        return cls(view[HEADER.size:], 0, count)
+
+    def to_bytes(self) -> bytes:
+        """Сериализовать с заголовком (представление со сдвигом перепаковывается)."""
+        if self.start % MOVES_PER_GROUP:
+            return encode_moves(self).to_bytes()
+        first = self.start // MOVES_PER_GROUP * GROUP_SIZE
+        last = first + -(-self.count // MOVES_PER_GROUP) * GROUP_SIZE
+        return HEADER.pack(MAGIC, VERSION, self.count) + bytes(self.payload[first:last])
+
+    def _code(self, index: int) -> int:
+        bit = (self.start + index) * BITS_PER_MOVE
+        byte = bit >> 3
+        value = int.from_bytes(self.payload[byte:byte + 2], 'little')
+        return (value >> (bit & 7)) & 0b111
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        # Выравниваемся на границу группы, дальше распаковываем по 8 ходов за раз
+        index = 0
+        while index < self.count and (self.start + index) % MOVES_PER_GROUP:
+            yield MOVES[self._code(index)]
+            index += 1
+        byte = (self.start + index) // MOVES_PER_GROUP * GROUP_SIZE
+        payload = self.payload
+        while index < self.count:
+            group = int.from_bytes(payload[byte:byte + GROUP_SIZE], 'little')
+            for _ in range(min(MOVES_PER_GROUP, self.count - index)):
+                yield MOVES[group & 0b111]
+                group >>= BITS_PER_MOVE
+            index += MOVES_PER_GROUP
+            byte += GROUP_SIZE
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Tuple[str, str], 'PackedMoves']:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.count)
+            if step != 1:
+                return encode_moves(self[i] for i in range(start, stop, step))
+            return PackedMoves(self.payload, self.start + start, max(0, stop - start))
+        if key < 0:
+            key += self.count
+        if not 0 <= key < self.count:
+            raise IndexError("Номер хода вне последовательности.")
+        return MOVES[self._code(key)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (PackedMoves, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
@@ -12,6 +12,7 @@ from typing import Any, Optional, Tuple
 
 
 class Node:
+    __slots__ = ('parent', 'children', 'depth', 'move', 'situation', 'id')
     _id_counter = 0
 
     def __init__(self, situation: Any, parent: Optional['Node'] = None, move: Optional[Tuple[str, str]] = None,
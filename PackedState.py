@@ -0,0 +1,230 @@
+"""
+PackedState.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Компактное представление состояния Ханойской башни одним целым числом.
+На каждый диск отводится поле с номером стержня (0 - A, 1 - B, 2 - C, ...):
+2 бита для трёх-четырёх стержней, больше - для большего числа стержней.
+Диск d хранится в битах [w*(d-1), w*d), где w - ширина поля.
+Преемники вычисляются через заранее подготовленные маски стержней,
+без создания промежуточных списков и кортежей.
+"""
+
+from functools import lru_cache
+from string import ascii_uppercase
+from typing import Iterator, List, Optional, Tuple
+
+BITS_PER_DISK = 2  # Ширина поля для трёх-четырёх стержней
+ROD_NAMES = ('A', 'B', 'C')
+
+
+def rod_names_for(num_rods: int) -> Tuple[str, ...]:
+    """Имена стержней: A, B, C, D, ..."""
+    return tuple(ascii_uppercase[:num_rods])
+
+
+class PackedHanoi:
+    """Движок состояний Ханойской башни, работающий с упакованными целыми числами."""
+
+    def __init__(self, num_disks: int, rod_names: Tuple[str, ...] = ROD_NAMES):
+        """
+        Args:
+            num_disks: Количество дисков.
+            rod_names: Имена стержней в порядке их индексов.
+        """
+        self.num_disks = num_disks
+        self.rod_names = rod_names
+        self.num_rods = len(rod_names)
+        self.bits_per_disk = max(BITS_PER_DISK, (self.num_rods - 1).bit_length())
+        self.field_mask = (1 << self.bits_per_disk) - 1
+
+        # Младший бит каждого поля: для 2 бит 0b...010101
+        self.low_bits = sum(1 << (self.bits_per_disk * i) for i in range(num_disks))
+        self.full_mask = self.low_bits * self.field_mask
+        # Маска стержня r: номер r, повторённый в каждом поле
+        self.rod_patterns = tuple(self.low_bits * r for r in range(self.num_rods))
+        # Младший бит поля каждого диска: disk_bits[d - 1]
+        self.disk_bits = tuple(1 << (self.bits_per_disk * i) for i in range(num_disks))
+        # Таблица ходов: готовые кортежи (source, destination), чтобы не создавать их заново
+        self.moves = tuple(
+            tuple((src, dst) for dst in rod_names) for src in rod_names
+        )
+        # Пары индексов (source, destination) в порядке перебора get_next_situations
+        self.pairs = tuple(
+            (s, d) for s in range(self.num_rods) for d in range(self.num_rods) if s != d
+        )
+
+    # ------------------------------------------------------------------
+    # Преобразование между кортежами и числами
+    # ------------------------------------------------------------------
+    def encode(self, situation: Tuple[Tuple[int, ...], ...]) -> int:
+        """Упаковать кортеж кортежей дисков в целое число."""
+        state = 0
+        for rod_idx, disks in enumerate(situation):
+            for disk in disks:
+                state |= rod_idx << (self.bits_per_disk * (disk - 1))
+        return state
+
+    def decode(self, state: int) -> Tuple[Tuple[int, ...], ...]:
+        """Распаковать целое число в кортеж кортежей дисков (снизу вверх: от большого к малому)."""
+        rods: List[List[int]] = [[] for _ in range(self.num_rods)]
+        bits, mask = self.bits_per_disk, self.field_mask
+        for disk in range(self.num_disks, 0, -1):
+            rods[(state >> (bits * (disk - 1))) & mask].append(disk)
+        return tuple(tuple(disks) for disks in rods)
+
+    def rod_of(self, state: int, disk: int) -> int:
+        """Индекс стержня, на котором лежит диск."""
+        return (state >> (self.bits_per_disk * (disk - 1))) & self.field_mask
+
+    # ------------------------------------------------------------------
+    # Генерация ходов
+    # ------------------------------------------------------------------
+    def top_bit(self, state: int, rod_idx: int) -> int:
+        """
+        Младший бит поля верхнего диска на стержне (0, если стержень пуст).
+        Чем меньше бит, тем меньше диск.
+        """
+        x = state ^ self.rod_patterns[rod_idx]
+        # Поле равно нулю только у дисков этого стержня
+        folded = x | (x >> 1)
+        for shift in range(2, self.bits_per_disk):
+            folded |= x >> shift
+        empty = ~folded & self.low_bits
+        return empty & -empty
+
+    def top_disk(self, state: int, rod_idx: int) -> int:
+        """Номер верхнего диска на стержне (0, если стержень пуст)."""
+        bit = self.top_bit(state, rod_idx)
+        return (bit.bit_length() - 1) // self.bits_per_disk + 1 if bit else 0
+
+    def rod_mask(self, state: int, rod_idx: int) -> int:
+        """Младшие биты полей всех дисков, лежащих на стержне."""
+        x = state ^ self.rod_patterns[rod_idx]
+        folded = x | (x >> 1)
+        for shift in range(2, self.bits_per_disk):
+            folded |= x >> shift
+        return ~folded & self.low_bits
+
+    def iter_successors(self, state: int) -> Iterator[Tuple[int, int, int]]:
+        """
+        Перебрать преемников состояния.
+        Yields:
+            (next_state, source_idx, destination_idx)
+        """
+        tops = [self.top_bit(state, r) for r in range(self.num_rods)]
+        for src, dst in self.pairs:
+            bit = tops[src]
+            if not bit:
+                continue
+            dst_bit = tops[dst]
+            if not dst_bit or dst_bit > bit:  # Можно перемещать только на больший диск или пустой
+                yield state + (dst - src) * bit, src, dst
+
+    def get_next_situations(self, state: int, num_disks: Optional[int] = None,
+                            gradient: bool = False) -> List[Tuple[int, Tuple[str, str]]]:
+        """
+        Аналог HanoiTower.get_next_situations для упакованных состояний.
+        Сигнатура совместима, поэтому функцию можно передавать в Solver.
+        """
+        if gradient:
+            return [(next_state, move) for next_state, move, _ in self.scored_successors(state, True)]
+        moves = self.moves
+        return [(next_state, moves[src][dst]) for next_state, src, dst in self.iter_successors(state)]
+
+    def scored_successors(self, state: int, gradient: bool = False, skip_bit: int = 0,
+                          counts: Optional[Tuple[int, int]] = None) -> \
+            List[Tuple[int, Tuple[str, str], Tuple[int, int]]]:
+        """
+        Преемники вместе со счётчиками target_counts, полученными приращением от счётчиков родителя за O(1).
+        При gradient=True порядок тот же, что у сортировки по score по убыванию, но без сортировки:
+        ход меняет счёт лишь на одно из пяти значений, и преемники раскладываются по пяти корзинам.
+        Args:
+            state: Текущее состояние.
+            gradient: Упорядочить по оценке.
+            skip_bit: Бит диска, который не двигать (0 - двигать любые).
+            counts: Счётчики самого state, если уже известны (иначе считаются заново).
+        Returns:
+            Список (next_state, move, (correct, on_target)).
+        """
+        if counts is None:
+            counts = self.target_counts(state)
+        tops = [self.top_bit(state, r) for r in range(self.num_rods)]
+        moves = self.moves
+        buckets = [[], [], [], [], []] if gradient else None
+        next_situations = []
+        for src, dst in self.pairs:
+            bit = tops[src]
+            if not bit or bit == skip_bit:
+                continue
+            dst_bit = tops[dst]
+            if dst_bit and dst_bit < bit:  # Можно перемещать только на больший диск или пустой
+                continue
+            child_counts = self.child_counts(counts, bit, src, dst)
+            item = (state + (dst - src) * bit, moves[src][dst], child_counts)
+            if gradient:
+                # Приращение счёта -10 * dc - 5 * do; корзина 0 - наибольшее (+15), 4 - наименьшее (-15)
+                buckets[2 + child_counts[0] - counts[0] + child_counts[1] - counts[1]].append(item)
+            else:
+                next_situations.append(item)
+        if gradient:
+            for bucket in buckets:
+                next_situations += bucket
+        return next_situations
+
+    def apply_move(self, state: int, source_idx: int, destination_idx: int) -> int:
+        """Применить ход без проверки допустимости."""
+        return state + (destination_idx - source_idx) * self.top_bit(state, source_idx)
+
+    # ------------------------------------------------------------------
+    # Оценки
+    # ------------------------------------------------------------------
+    def target_counts(self, state: int) -> Tuple[int, int]:
+        """
+        Подсчитать диски на целевом (последнем) стержне битовыми операциями, без цикла по дискам.
+        Returns:
+            (правильно уложенные снизу вверх, всего на целевом стержне)
+        """
+        on_target = self.rod_mask(state, self.num_rods - 1)
+        # Диски, правильно уложенные на C снизу вверх: сплошная цепочка от наибольшего,
+        # то есть все диски больше наибольшего из лежащих не на C
+        missing = self.low_bits & ~on_target
+        correct = self.num_disks - (missing.bit_length() - 1) // self.bits_per_disk - 1 if missing else self.num_disks
+        return correct, bin(on_target).count('1')
+
+    def child_counts(self, counts: Tuple[int, int], bit: int, source_idx: int, destination_idx: int) -> \
+            Tuple[int, int]:
+        """Счётчики target_counts после хода диска bit, по счётчикам до хода, за O(1)."""
+        correct, on_target = counts
+        target_rod = self.num_rods - 1
+        if destination_idx == target_rod:
+            on_target += 1
+            # Цепочка растёт, только если лёг следующий по размеру недостающий диск
+            if correct < self.num_disks and bit == self.disk_bits[self.num_disks - correct - 1]:
+                correct += 1
+        elif source_idx == target_rod:
+            on_target -= 1
+            if correct and bit == self.disk_bits[self.num_disks - correct]:
+                correct -= 1
+        return correct, on_target
+
+    def score(self, state: int) -> float:
+        """Аналог score_situation: меньший счёт = лучшее состояние."""
+        correct, on_target = self.target_counts(state)
+        return -10.0 * correct + 5 * (self.num_disks - on_target)
+
+    def goal_state(self, rod_idx: Optional[int] = None) -> int:
+        """Состояние, в котором все диски лежат на одном стержне (по умолчанию - последнем)."""
+        if rod_idx is None:
+            rod_idx = self.num_rods - 1
+        return self.rod_patterns[rod_idx]
+
+
+@lru_cache(maxsize=None)
+def get_engine(num_disks: int, rod_names: Tuple[str, ...] = ROD_NAMES) -> PackedHanoi:
+    """Вернуть общий (кешированный) движок для заданного числа дисков и стержней."""
+    return PackedHanoi(num_disks, rod_names)
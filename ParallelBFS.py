@@ -0,0 +1,215 @@
+"""
+ParallelBFS.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Многопроцессный поиск в ширину с разделением состояний по хешу.
+Каждое упакованное состояние принадлежит одному рабочему процессу (owner = hash(state) % workers).
+Поиск идёт по уровням: рабочие раскрывают свою часть фронта и возвращают детей пачками,
+координатор пересылает пачки владельцам, те отсеивают повторы. Барьер после каждого уровня
+сохраняет оптимальность.
+Чтобы путь совпадал с solve_wide, у каждого состояния есть ключ порядка
+(позиция родителя в уровне, номер хода у родителя) - ровно порядок очереди solve_wide.
+Из кандидатов владелец оставляет ребёнка с наименьшим ключом, а координатор
+после уровня перенумеровывает фронт по этим ключам.
+"""
+
+import heapq
+import os
+import time
+from array import array
+from multiprocessing import Pipe, Process
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PackedState import ROD_NAMES, get_engine
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+
+def owner_of(state: int, workers: int) -> int:
+    """Номер рабочего, которому принадлежит состояние (мультипликативный хеш)."""
+    return (((state * _HASH_MULTIPLIER) & _MASK_64) >> 32) % workers
+
+
+def _worker_loop(conn, workers: int, num_disks: int, gradient: bool, rod_names: Tuple[str, ...] = ROD_NAMES) -> None:
+    """Цикл рабочего процесса: обрабатывает команды координатора до 'stop'."""
+    engine = get_engine(num_disks, rod_names)
+    max_moves = len(engine.pairs)  # Ходов из одного состояния не больше числа пар стержней
+    pair_codes = {engine.moves[source][destination]: code for code, (source, destination) in enumerate(engine.pairs)}
+    parents: Dict[int, Tuple[int, int]] = {}  # состояние -> (родитель, код хода)
+    frontier: List[int] = []  # Состояния текущего уровня в порядке ключей
+    positions: Sequence[int] = ()  # Глобальные позиции состояний фронта
+    candidates: Dict[int, Tuple[int, int, int]] = {}
+
+    while True:
+        command, payload = conn.recv()
+        if command == 'start':
+            parents[payload] = (payload, -1)
+            frontier, positions = [payload], [0]
+            conn.send(None)
+        elif command == 'expand':
+            # Дети раскладываются по владельцам: [child, parent, key, code] подряд в array('Q')
+            buckets = [array('Q') for _ in range(workers)]
+            for state, position in zip(frontier, positions):
+                next_situations = engine.get_next_situations(state, gradient=gradient)
+                for move_idx, (next_state, move) in enumerate(next_situations):
+                    buckets[owner_of(next_state, workers)].extend(
+                        (next_state, state, position * max_moves + move_idx, pair_codes[move]))
+            conn.send([bucket.tobytes() for bucket in buckets])
+        elif command == 'absorb':
+            candidates = {}
+            for raw in payload:
+                bucket = array('Q')
+                bucket.frombytes(raw)
+                for i in range(0, len(bucket), 4):
+                    child, parent, key, code = bucket[i:i + 4]
+                    if child in parents:
+                        continue
+                    best = candidates.get(child)
+                    if best is None or key < best[1]:
+                        candidates[child] = (parent, key, code)
+            frontier = sorted(candidates, key=lambda state: candidates[state][1])
+            for state in frontier:
+                parent, _, code = candidates[state]
+                parents[state] = (parent, code)
+            conn.send(array('Q', (candidates[state][1] for state in frontier)).tobytes())
+        elif command == 'positions':
+            positions = array('Q')
+            positions.frombytes(payload)
+            conn.send(None)
+        elif command == 'find':
+            # Попало ли состояние в только что построенный уровень
+            conn.send(payload in candidates)
+        elif command == 'parent':
+            conn.send(parents.get(payload))
+        elif command == 'stop':
+            conn.close()
+            return
+
+
+class ParallelBFS:
+    """Координатор параллельного поиска в ширину."""
+
+    def __init__(self, num_disks: int, workers: Optional[int] = None, gradient: bool = False,
+                 rod_names: Tuple[str, ...] = ROD_NAMES):
+        self.num_disks = num_disks
+        self.workers = workers or os.cpu_count() or 1
+        self.gradient = gradient
+        self.rod_names = rod_names
+        self.engine = get_engine(num_disks, rod_names)
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self) -> 'ParallelBFS':
+        for _ in range(self.workers):
+            parent_conn, child_conn = Pipe()
+            process = Process(target=_worker_loop,
+                              args=(child_conn, self.workers, self.num_disks, self.gradient, self.rod_names),
+                              daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for conn in self._connections:
+            conn.send(('stop', None))
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections, self._processes = [], []
+
+    def _broadcast(self, command: str, payloads: Sequence) -> List:
+        """Отправить команду всем рабочим и дождаться ответов (барьер)."""
+        for conn, payload in zip(self._connections, payloads):
+            conn.send((command, payload))
+        return [conn.recv() for conn in self._connections]
+
+    def _ask(self, state: int, command: str):
+        conn = self._connections[owner_of(state, self.workers)]
+        conn.send((command, state))
+        return conn.recv()
+
+    def solve(self, start: int, goal: int, max_depth: int) -> Optional[List[Tuple[str, str]]]:
+        """
+        Найти кратчайший путь между упакованными состояниями.
+        Returns:
+            Тот же список шагов, что и у Solver.solve_wide, или None.
+        """
+        if start == goal:
+            return []
+        self._ask(start, 'start')
+        none = [None] * self.workers
+
+        for _ in range(max_depth):
+            buckets = self._broadcast('expand', none)
+            # Пересылка: рабочий j получает от каждого i пачку buckets[i][j]
+            routed = [[buckets[i][j] for i in range(self.workers)] for j in range(self.workers)]
+            replies = self._broadcast('absorb', routed)
+            keys = []
+            for raw in replies:
+                worker_keys = array('Q')
+                worker_keys.frombytes(raw)
+                keys.append(worker_keys)
+            if not any(keys):
+                return None
+
+            # Глобальная перенумерация уровня по ключам (порядок очереди solve_wide)
+            positions = [array('Q', [0]) * len(worker_keys) for worker_keys in keys]
+            merged = heapq.merge(*(zip(worker_keys, [worker] * len(worker_keys), range(len(worker_keys)))
+                                   for worker, worker_keys in enumerate(keys)))
+            for position, (_, worker, i) in enumerate(merged):
+                positions[worker][i] = position
+            self._broadcast('positions', [worker_positions.tobytes() for worker_positions in positions])
+
+            if self._ask(goal, 'find'):
+                return self._rebuild_path(start, goal)
+
+        return None
+
+    def _rebuild_path(self, start: int, goal: int) -> List[Tuple[str, str]]:
+        """Восстановить путь, спрашивая у владельцев родителей состояний."""
+        path = []
+        state = goal
+        while state != start:
+            parent, code = self._ask(state, 'parent')
+            source, destination = self.engine.pairs[code]
+            path.append(self.engine.moves[source][destination])
+            state = parent
+        return path[::-1]
+
+
+def solve_parallel(start: int, goal: int, num_disks: int, max_depth: int, workers: Optional[int] = None,
+                   gradient: bool = False, rod_names: Tuple[str, ...] = ROD_NAMES) -> Optional[List[Tuple[str, str]]]:
+    """Запустить рабочие процессы, решить одну задачу и остановить их."""
+    with ParallelBFS(num_disks, workers, gradient, rod_names) as bfs:
+        return bfs.solve(start, goal, max_depth)
+
+
+def benchmark(num_disks: int, worker_counts: Sequence[int] = (1, 2, 4, 8, 16)) -> List[Tuple[int, float]]:
+    """Замерить время решения стандартной задачи при разном числе рабочих."""
+    engine = get_engine(num_disks)
+    start, goal = engine.goal_state(0), engine.goal_state()
+    results = []
+    for workers in worker_counts:
+        started = time.perf_counter()
+        solve_parallel(start, goal, num_disks, 2 ** num_disks, workers)
+        elapsed = time.perf_counter() - started
+        results.append((workers, elapsed))
+        print(f"Рабочих: {workers:3d}  время: {elapsed:8.3f} с")
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Масштабирование параллельного поиска в ширину")
+    parser.add_argument('--disks', type=int, default=12, help="Количество дисков")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help="Число рабочих")
+    args = parser.parse_args()
+    benchmark(args.disks, args.workers)
@@ -0,0 +1,162 @@
+"""
+PatternDatabase.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Базы образцов (pattern databases) для эвристики ветвей и границ.
+Абстракция оставляет только выбранные диски (например, k наибольших), остальные убираются.
+Для неё обратным поиском в ширину от цели строится таблица расстояний uint8,
+которая один раз записывается на диск, а при запуске решателя отображается в память (mmap).
+Несколько непересекающихся баз объединяются по максимуму - оценка остаётся допустимой.
+"""
+
+import mmap
+import struct
+from array import array
+from collections import deque
+from typing import Any, Iterable, List, Optional, Sequence
+
+from Heuristics import Heuristic, situation_to_positions
+
+MAGIC = b'HPDB'
+HEADER = struct.Struct('<4sBBB')  # magic, version, num_rods, количество дисков в образце
+VERSION = 1
+UNREACHED = 255  # Расстояния больше 254 в uint8 не помещаются
+
+
+def _rank(positions: Sequence[int], num_rods: int) -> int:
+    """Номер абстрактного состояния: позиции дисков (от меньшего к большему) в системе счисления num_rods."""
+    index = 0
+    for rod_idx in reversed(positions):
+        index = index * num_rods + rod_idx
+    return index
+
+
+def _unrank(index: int, size: int, num_rods: int) -> List[int]:
+    """Обратное к _rank."""
+    positions = []
+    for _ in range(size):
+        index, rod_idx = divmod(index, num_rods)
+        positions.append(rod_idx)
+    return positions
+
+
+def build_pattern_database(disks: Iterable[int], goal_situation: Any, num_disks: int, path: str,
+                           num_rods: int = 3) -> None:
+    """
+    Построить базу образцов и записать её в файл.
+    Args:
+        disks: Диски, входящие в образец (например, range(num_disks, num_disks - k, -1)).
+        goal_situation: Целевое состояние полной задачи.
+        num_disks: Количество дисков полной задачи.
+        path: Путь к файлу таблицы.
+        num_rods: Количество стержней.
+    """
+    disks = sorted(disks)
+    size = len(disks)
+    goal_positions = situation_to_positions(goal_situation, num_disks, num_rods)
+    pattern_goal = [goal_positions[disk] for disk in disks]
+
+    table = array('B', [UNREACHED]) * (num_rods ** size)
+    start = _rank(pattern_goal, num_rods)
+    table[start] = 0
+    queue = deque([start])
+
+    # Ходы обратимы, поэтому поиск в ширину от цели даёт расстояния до цели
+    while queue:
+        index = queue.popleft()
+        distance = table[index] + 1
+        if distance >= UNREACHED:
+            continue
+        positions = _unrank(index, size, num_rods)
+        # Верхний диск стержня - наименьший из лежащих на нём (позиции идут от меньшего к большему)
+        tops = [None] * num_rods
+        for i, rod_idx in enumerate(positions):
+            if tops[rod_idx] is None:
+                tops[rod_idx] = i
+        for source in range(num_rods):
+            i = tops[source]
+            if i is None:
+                continue
+            for destination in range(num_rods):
+                if destination == source or (tops[destination] is not None and tops[destination] < i):
+                    continue
+                next_index = index + (destination - source) * num_rods ** i
+                if table[next_index] == UNREACHED:
+                    table[next_index] = distance
+                    queue.append(next_index)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, num_rods, size))
+        f.write(bytes(disks))
+        f.write(bytes(pattern_goal))
+        table.tofile(f)
+
+
+class PatternDatabase:
+    """Таблица расстояний одного образца, отображённая в память только для чтения."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.num_rods, size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Файл {path} не является базой образцов версии {VERSION}.")
+        offset = HEADER.size
+        self.disks = list(self._mmap[offset:offset + size])
+        self.goal_positions = list(self._mmap[offset + size:offset + 2 * size])
+        self._table_offset = offset + 2 * size
+        # memoryview без копирования: несколько процессов делят одни страницы файла
+        self.table = memoryview(self._mmap)[self._table_offset:]
+
+    def lookup(self, positions: Sequence[int]) -> int:
+        """Расстояние для полного состояния, заданного позициями дисков (positions[d])."""
+        num_rods = self.num_rods
+        index = 0
+        for disk in reversed(self.disks):
+            index = index * num_rods + positions[disk]
+        return self.table[index]
+
+    def matches_goal(self, goal_positions: Sequence[int]) -> bool:
+        """Построена ли база для этой цели."""
+        return all(goal_positions[disk] == rod_idx for disk, rod_idx in zip(self.disks, self.goal_positions))
+
+    def close(self) -> None:
+        """Освободить отображение файла."""
+        self.table.release()
+        self._mmap.close()
+
+
+class PatternDatabaseHeuristic(Heuristic):
+    """Максимум по нескольким базам образцов."""
+
+    def __init__(self, databases: List[PatternDatabase], num_disks: int):
+        self.databases = databases
+        self.num_disks = num_disks
+        num_rods = {db.num_rods for db in databases}
+        if len(num_rods) > 1:
+            raise ValueError("Базы образцов построены для разного числа стержней.")
+        self.num_rods = num_rods.pop() if num_rods else 3
+        self._checked_goal: Optional[Any] = None
+
+    @classmethod
+    def load(cls, paths: Iterable[str], num_disks: int) -> 'PatternDatabaseHeuristic':
+        """Отобразить в память таблицы из файлов."""
+        return cls([PatternDatabase(path) for path in paths], num_disks)
+
+    def estimate(self, situation: Any, goal_situation: Any) -> float:
+        if goal_situation != self._checked_goal:
+            goal_positions = situation_to_positions(goal_situation, self.num_disks, self.num_rods)
+            if not all(db.matches_goal(goal_positions) for db in self.databases):
+                raise ValueError("База образцов построена для другой целевой ситуации.")
+            self._checked_goal = goal_situation
+        positions = situation_to_positions(situation, self.num_disks, self.num_rods)
+        return max((db.lookup(positions) for db in self.databases), default=0)
+
+    def close(self) -> None:
+        """Закрыть все таблицы."""
+        for db in self.databases:
+            db.close()
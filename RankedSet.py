@@ -0,0 +1,108 @@
+"""
+RankedSet.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Компактные множества посещённых состояний на основе совершенного хеширования.
+Допустимое состояние с n дисками на трёх стержнях однозначно задаётся номером стержня
+каждого диска, поэтому отображается в число из [0, 3^n) (ранг).
+RankedBitset - замена set (1 бит на состояние),
+RankedCostArray - замена dict состояние -> g (uint8/uint16/uint32 на состояние).
+Принимаются как кортежи кортежей (A, B, C), так и упакованные числа PackedHanoi.
+"""
+
+from array import array
+from typing import Any, Iterable
+
+NUM_RODS = 3
+# Ранг одного байта упакованного состояния: 4 диска по 2 бита -> 4 троичные цифры
+_BYTE_RANKS = tuple(
+    sum(((byte >> (2 * i)) & 3) * 3 ** i for i in range(4)) for byte in range(256)
+)
+
+
+def rank_situation(situation: Any, num_disks: int) -> int:
+    """Ранг состояния: позиции дисков (диск 1 - младшая цифра) в троичной системе."""
+    if isinstance(situation, int):
+        rank = 0
+        multiplier = 1
+        for byte in situation.to_bytes((num_disks + 3) // 4, 'little'):
+            rank += _BYTE_RANKS[byte] * multiplier
+            multiplier *= 81
+        return rank
+    rank = 0
+    for rod_idx, disks in enumerate(situation):
+        for disk in disks:
+            rank += rod_idx * 3 ** (disk - 1)
+    return rank
+
+
+class RankedBitset:
+    """Множество состояний в виде битовой карты по рангу. Совместимо с set по add / in / len."""
+
+    def __init__(self, num_disks: int, situations: Iterable[Any] = ()):
+        self.num_disks = num_disks
+        self._bits = bytearray((NUM_RODS ** num_disks + 7) // 8)
+        self._size = 0
+        for situation in situations:
+            self.add(situation)
+
+    def add(self, situation: Any) -> None:
+        """Добавить состояние."""
+        rank = rank_situation(situation, self.num_disks)
+        mask = 1 << (rank & 7)
+        byte = self._bits[rank >> 3]
+        if not byte & mask:
+            self._bits[rank >> 3] = byte | mask
+            self._size += 1
+
+    def __contains__(self, situation: Any) -> bool:
+        rank = rank_situation(situation, self.num_disks)
+        return bool(self._bits[rank >> 3] & (1 << (rank & 7)))
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class RankedCostArray:
+    """
+    Словарь состояние -> g в виде плотного массива по рангу. Совместим с dict по get / in / [] / len.
+    Тип элементов выбирается по наибольшему ожидаемому g (max_cost): uint8, uint16 или uint32.
+    """
+
+    def __init__(self, num_disks: int, max_cost: int = 254):
+        self.num_disks = num_disks
+        if max_cost < 0xFF:
+            typecode = 'B'
+        elif max_cost < 0xFFFF:
+            typecode = 'H'
+        else:
+            typecode = 'I'
+        self._unset = (1 << (8 * array(typecode).itemsize)) - 1  # Максимум типа - "не посещено"
+        self._costs = array(typecode, [self._unset]) * (NUM_RODS ** num_disks)
+        self._size = 0
+
+    def get(self, situation: Any, default: Any = None) -> Any:
+        cost = self._costs[rank_situation(situation, self.num_disks)]
+        return default if cost == self._unset else cost
+
+    def __contains__(self, situation: Any) -> bool:
+        return self._costs[rank_situation(situation, self.num_disks)] != self._unset
+
+    def __getitem__(self, situation: Any) -> int:
+        cost = self._costs[rank_situation(situation, self.num_disks)]
+        if cost == self._unset:
+            raise KeyError(situation)
+        return cost
+
+    def __setitem__(self, situation: Any, cost: int) -> None:
+        rank = rank_situation(situation, self.num_disks)
+        if self._costs[rank] == self._unset:
+            self._size += 1
+        self._costs[rank] = cost
+
+    def __len__(self) -> int:
+        return self._size
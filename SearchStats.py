@@ -0,0 +1,172 @@
+"""
+SearchStats.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Инструментирование поиска Solver.
+SearchStats - результат: раскрытые узлы, пиковый размер фронта (очереди / стека / кучи),
+размер множества посещённых, повторные попадания, время в генерации ходов и в эвристике,
+пиковая память по tracemalloc. Экспортируется в JSON для отслеживания регрессий.
+SearchMonitor собирает статистику, оборачивая генератор ходов и эвристику, поэтому
+циклы поиска не меняются, а без монитора накладных расходов нет совсем.
+Наблюдатель вызывается на каждом раскрытии или раз в every раскрытий.
+"""
+
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+# Наблюдатель получает текущую (ещё не завершённую) статистику
+Observer = Callable[['SearchStats'], None]
+
+
+class SearchStats:
+    """Статистика одного запуска поиска."""
+
+    def __init__(self, strategy: str):
+        self.strategy = strategy
+        self.found = False
+        self.path_length: Optional[int] = None
+        self.nodes_expanded = 0
+        self.successors_generated = 0
+        self.duplicate_hits = 0
+        self.peak_frontier = 0
+        self.visited_size = 0
+        self.expand_time = 0.0  # Время в get_next_situations, с
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0  # Время в эвристике, с
+        self.wall_time = 0.0
+        self.peak_memory: Optional[int] = None  # Пик tracemalloc, байт
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Сериализовать в JSON (аргументы передаются json.dumps)."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __repr__(self) -> str:
+        return f"SearchStats({', '.join(f'{k}={v!r}' for k, v in self.__dict__.items())})"
+
+
+class SearchMonitor:
+    """Сборщик статистики, который Solver подключает к стратегии."""
+
+    def __init__(self, strategy: str, observer: Optional[Observer] = None, every: int = 1,
+                 trace_memory: bool = False):
+        """
+        Args:
+            strategy: Имя стратегии.
+            observer: Функция, вызываемая с текущей статистикой.
+            every: Вызывать наблюдателя раз в every раскрытий.
+            trace_memory: Измерять пиковую память через tracemalloc.
+        """
+        self.stats = SearchStats(strategy)
+        self.observer = observer
+        self.every = max(1, every)
+        self.trace_memory = trace_memory
+        self._frontier_size: Callable[[], int] = lambda: 0
+        self._visited_size: Callable[[], int] = lambda: 0
+        self._accepted: Callable[[], int] = lambda: 0
+        self._started = 0.0
+        self._own_tracing = False
+
+    def start(self) -> None:
+        if self.trace_memory:
+            self._own_tracing = not tracemalloc.is_tracing()
+            if self._own_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+
+    def attach(self, frontier_size: Callable[[], int], visited_size: Callable[[], int],
+               accepted: Callable[[], int]) -> None:
+        """
+        Подключить структуры стратегии (функции читают текущие локальные переменные поиска).
+        Args:
+            frontier_size: Размер фронта.
+            visited_size: Размер множества посещённых.
+            accepted: Сколько сгенерированных ходов приняты как новые узлы.
+        """
+        self._frontier_size = frontier_size
+        self._visited_size = visited_size
+        self._accepted = accepted
+
+    def wrap_successors(self, get_next_situations: Callable) -> Callable:
+        """Обернуть генератор ходов: одно обращение - одно раскрытие."""
+        stats = self.stats
+        clock = time.perf_counter
+
+        def instrumented(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            next_situations = get_next_situations(*args, **kwargs)
+            stats.expand_time += clock() - started
+            stats.nodes_expanded += 1
+            stats.successors_generated += len(next_situations)
+            frontier = self._frontier_size()
+            if frontier > stats.peak_frontier:
+                stats.peak_frontier = frontier
+            if self.observer is not None and stats.nodes_expanded % self.every == 0:
+                self._refresh()
+                self.observer(stats)
+            return next_situations
+
+        return instrumented
+
+    def record_batch(self, expanded: int, generated: int, accepted: int, frontier: int) -> None:
+        """
+        Учесть сразу пачку раскрытий (стратегии, раскрывающие фронт целиком: векторная, внешняя).
+        Args:
+            expanded: Раскрыто узлов в пачке.
+            generated: Сгенерировано ходов в пачке.
+            accepted: Всего принято новых состояний с начала поиска.
+            frontier: Текущий размер фронта.
+        """
+        stats = self.stats
+        before = stats.nodes_expanded
+        stats.nodes_expanded += expanded
+        stats.successors_generated += generated
+        if frontier > stats.peak_frontier:
+            stats.peak_frontier = frontier
+        self._frontier_size = lambda: frontier
+        self._visited_size = lambda: accepted + 1
+        self._accepted = lambda: accepted
+        if self.observer is not None and stats.nodes_expanded // self.every != before // self.every:
+            self._refresh()
+            self.observer(stats)
+
+    def wrap_heuristic(self, estimate: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Обернуть функцию оценки."""
+        stats = self.stats
+        clock = time.perf_counter
+
+        def instrumented(situation: Any) -> Any:
+            started = clock()
+            h = estimate(situation)
+            stats.heuristic_time += clock() - started
+            stats.heuristic_calls += 1
+            return h
+
+        return instrumented
+
+    def _refresh(self) -> None:
+        stats = self.stats
+        stats.visited_size = self._visited_size()
+        stats.duplicate_hits = max(0, stats.successors_generated - self._accepted())
+        stats.wall_time = time.perf_counter() - self._started
+
+    def finish(self, path: Optional[Any]) -> SearchStats:
+        """Завершить сбор и вернуть статистику."""
+        self._refresh()
+        stats = self.stats
+        stats.found = path is not None
+        stats.path_length = None if path is None else len(path)
+        if self.trace_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._own_tracing:
+                tracemalloc.stop()
+        return stats
@@ -0,0 +1,265 @@
+"""
+SolutionCache.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Кеш решений перед Solver.
+Ключ - канонизированные (начало, цель, стратегия, max_depth) и настройки решателя, от которых
+зависит ответ (число дисков и стержней, gradient, эвристика, symmetry): ситуации приводятся к упакованному числу.
+Первый уровень - LRU в памяти процесса, второй - файл SQLite с вытеснением по размеру
+(давно не использованные решения удаляются первыми).
+Для оптимальных стратегий запоминаются и все состояния на найденном пути (на обоих уровнях):
+суффикс кратчайшего пути сам кратчайший, поэтому запрос из любого из них
+отвечается хвостом уже сохранённого решения.
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from MoveCodec import MOVE_CODES, PackedMoves, encode_moves
+from PackedState import get_engine, rod_names_for
+from Solver import Solver
+
+# Стратегии, которые всегда возвращают кратчайший путь (для них допустим поиск по суффиксу)
+OPTIMAL_STRATEGIES = frozenset({'solve_wide', 'solve_bidirectional', 'solve_vectorized', 'solve_parallel',
+                                'solve_external'})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    moves BLOB,
+    length INTEGER,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS suffixes (
+    state TEXT NOT NULL,
+    goal TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    solution_id INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (state, goal, strategy)
+);
+CREATE INDEX IF NOT EXISTS suffixes_solution ON suffixes (solution_id);
+CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used);
+"""
+SUFFIX_ROW_SIZE = 64  # Примерный размер строки суффикса в байтах для учёта объёма
+
+
+def _dump_moves(moves: List[Tuple[str, str]]) -> bytes:
+    """Упаковать ходы: 3 бита на ход для трёх стержней, иначе по два символа на ход."""
+    if all(move in MOVE_CODES for move in moves):
+        return b'P' + encode_moves(moves).to_bytes()
+    return b'S' + ''.join(source + destination for source, destination in moves).encode()
+
+
+def _load_moves(data: bytes) -> List[Tuple[str, str]]:
+    if data[:1] == b'P':
+        return list(PackedMoves.from_bytes(data[1:]))
+    text = data[1:].decode()
+    return [(text[i], text[i + 1]) for i in range(0, len(text), 2)]
+
+
+class CachedSolver:
+    """Обёртка над Solver с двухуровневым кешем решений."""
+
+    def __init__(self, solver: Solver, db_path: Optional[str] = None, memory_size: int = 1024,
+                 max_db_bytes: int = 256 << 20, max_suffix_length: int = 1 << 16):
+        """
+        Args:
+            solver: Решатель, к которому идут промахи кеша.
+            db_path: Файл SQLite (None - только кеш в памяти).
+            memory_size: Ёмкость LRU в памяти (число решений).
+            max_db_bytes: Предельный объём данных в файле кеша.
+            max_suffix_length: Пути длиннее не индексируются по состояниям.
+        """
+        self.solver = solver
+        self.engine = get_engine(solver.num_disks, rod_names_for(solver.num_rods))
+        self.memory_size = memory_size
+        self.max_db_bytes = max_db_bytes
+        self.max_suffix_length = max_suffix_length
+        self._memory: 'OrderedDict[str, Optional[List[Tuple[str, str]]]]' = OrderedDict()
+        # Суффиксы решений из памяти: (состояние, цель, стратегия) -> (ключ решения, смещение хвоста)
+        self._suffixes: Dict[Tuple[str, str, str], Tuple[str, int]] = {}
+        self._indexed: Dict[str, Tuple[str, str, str]] = {}  # Ключ решения -> (начало, цель, стратегия)
+        self._db = None
+        if db_path is not None:
+            self._db = sqlite3.connect(db_path)
+            self._db.executescript(_SCHEMA)
+        self.hits = self.misses = self.suffix_hits = 0
+
+    def close(self) -> None:
+        """Закрыть файл кеша."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _canonical(self, situation: Any) -> str:
+        return str(situation if isinstance(situation, int) else self.engine.encode(situation))
+
+    def _strategy_key(self, strategy: str) -> str:
+        # Задача (диски, стержни) и настройки, меняющие ответ: порядок ходов (gradient),
+        # эвристика и symmetry влияют на ответ неоптимальных стратегий
+        solver = self.solver
+        heuristic = type(solver.heuristic).__name__ if solver.heuristic is not None else '-'
+        return (f"{strategy}:{solver.num_disks}:{solver.num_rods}:{int(solver.gradient)}:{heuristic}:"
+                f"{int(solver.symmetry)}")
+
+    def _key(self, start: str, goal: str, strategy: str) -> str:
+        return f"{start}|{goal}|{self._strategy_key(strategy)}|{self.solver.max_depth}"
+
+    # ------------------------------------------------------------------
+    # Кеш в памяти
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, start: str, goal: str, strategy: str,
+                  moves: Optional[List[Tuple[str, str]]]) -> None:
+        if (key not in self._memory and moves is not None and strategy in OPTIMAL_STRATEGIES
+                and len(moves) <= self.max_suffix_length):
+            strategy_key = self._strategy_key(strategy)
+            for state, _, _, _, offset in self._suffix_rows(int(start), goal, strategy_key, key, moves):
+                self._suffixes.setdefault((state, goal, strategy_key), (key, offset))
+            self._indexed[key] = (start, goal, strategy_key)
+        self._memory[key] = moves
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._forget(*self._memory.popitem(last=False))
+
+    def _forget(self, key: str, moves: Optional[List[Tuple[str, str]]]) -> None:
+        """Убрать из индекса суффиксы вытесненного из памяти решения."""
+        indexed = self._indexed.pop(key, None)
+        if indexed is None:
+            return
+        start, goal, strategy_key = indexed
+        for state, _, _, _, _ in self._suffix_rows(int(start), goal, strategy_key, key, moves):
+            if self._suffixes.get((state, goal, strategy_key), (None,))[0] == key:
+                del self._suffixes[(state, goal, strategy_key)]
+
+    def _memory_suffix(self, start: str, goal: str, strategy: str) -> Optional[List[Tuple[str, str]]]:
+        """Хвост решения из памяти, проходящего через start, или None."""
+        if strategy not in OPTIMAL_STRATEGIES:
+            return None
+        entry = self._suffixes.get((start, goal, self._strategy_key(strategy)))
+        if entry is None:
+            return None
+        key, offset = entry
+        moves = self._memory[key][offset:]
+        if len(moves) > self.solver.max_depth:
+            return None
+        self._memory.move_to_end(key)
+        return moves
+
+    # ------------------------------------------------------------------
+    # Файл кеша
+    # ------------------------------------------------------------------
+    def _db_lookup(self, key: str, start: str, goal: str, strategy: str) -> Tuple[bool, Optional[List]]:
+        """(найдено, ходы) по точному ключу или по суффиксу сохранённого пути."""
+        row = self._db.execute("SELECT id, moves FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._touch(row[0])
+            return True, None if row[1] is None else _load_moves(row[1])
+
+        if strategy not in OPTIMAL_STRATEGIES:
+            return False, None
+        row = self._db.execute(
+            "SELECT s.id, s.moves, x.offset FROM suffixes x JOIN solutions s ON s.id = x.solution_id "
+            "WHERE x.state = ? AND x.goal = ? AND x.strategy = ?",
+            (start, goal, self._strategy_key(strategy))).fetchone()
+        if row is None:
+            return False, None
+        moves = _load_moves(row[1])[row[2]:]
+        if len(moves) > self.solver.max_depth:
+            return False, None
+        self._touch(row[0])
+        self.suffix_hits += 1
+        return True, moves
+
+    def _touch(self, solution_id: int) -> None:
+        with self._db:
+            self._db.execute("UPDATE solutions SET last_used = ? WHERE id = ?", (time.time(), solution_id))
+
+    def _db_store(self, key: str, start: str, goal: str, strategy: str,
+                  moves: Optional[List[Tuple[str, str]]]) -> None:
+        data = None if moves is None else _dump_moves(moves)
+        index_suffixes = (moves is not None and strategy in OPTIMAL_STRATEGIES
+                          and len(moves) <= self.max_suffix_length)
+        size = (len(data) if data else 0) + (SUFFIX_ROW_SIZE * len(moves) if index_suffixes else 0)
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT OR REPLACE INTO solutions (key, moves, length, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, data, None if moves is None else len(moves), size, time.time()))
+            if index_suffixes:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO suffixes (state, goal, strategy, solution_id, offset) VALUES (?, ?, ?, ?, ?)",
+                    self._suffix_rows(int(start), goal, self._strategy_key(strategy), cursor.lastrowid, moves))
+        self._evict()
+
+    def _suffix_rows(self, state: int, goal: str, strategy_key: str, solution_id: Any, moves: List[Tuple[str, str]]):
+        """Строки суффиксов: каждое промежуточное состояние пути и смещение хвоста."""
+        rod_index = {name: idx for idx, name in enumerate(self.engine.rod_names)}
+        for offset, (source, destination) in enumerate(moves):
+            if offset:
+                yield str(state), goal, strategy_key, solution_id, offset
+            state = self.engine.apply_move(state, rod_index[source], rod_index[destination])
+
+    def _evict(self) -> None:
+        """Удалять давно не использованные решения, пока объём больше предела."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+        if total <= self.max_db_bytes:
+            return
+        with self._db:
+            for solution_id, size in self._db.execute(
+                    "SELECT id, size FROM solutions ORDER BY last_used").fetchall():
+                if total <= self.max_db_bytes:
+                    break
+                self._db.execute("DELETE FROM suffixes WHERE solution_id = ?", (solution_id,))
+                self._db.execute("DELETE FROM solutions WHERE id = ?", (solution_id,))
+                total -= size
+
+    # ------------------------------------------------------------------
+    # Решение
+    # ------------------------------------------------------------------
+    def solve(self, strategy: str, current_situation: Any, goal_situation: Any,
+              get_next_situations: Optional[callable] = None) -> Optional[List[Tuple[str, str]]]:
+        """
+        Решить задачу выбранной стратегией Solver, используя кеш.
+        Args:
+            strategy: Имя метода Solver ('solve', 'solve_wide', 'solve_branches_and_bounds', ...).
+            current_situation: Текущее состояние.
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция генерации ходов.
+        Returns:
+            Список шагов или None, если решение не найдено.
+        """
+        start, goal = self._canonical(current_situation), self._canonical(goal_situation)
+        key = self._key(start, goal, strategy)
+
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            moves = self._memory[key]
+            return None if moves is None else list(moves)
+        moves = self._memory_suffix(start, goal, strategy)
+        if moves is not None:
+            self.hits += 1
+            self.suffix_hits += 1
+            return list(moves)
+
+        if self._db is not None:
+            found, moves = self._db_lookup(key, start, goal, strategy)
+            if found:
+                self.hits += 1
+                self._remember(key, start, goal, strategy, moves)
+                return None if moves is None else list(moves)
+
+        self.misses += 1
+        moves = getattr(self.solver, strategy)(current_situation, goal_situation, get_next_situations)
+        self._remember(key, start, goal, strategy, moves)
+        if self._db is not None:
+            self._db_store(key, start, goal, strategy, moves)
+        return None if moves is None else list(moves)
@@ -0,0 +1,162 @@
+"""
+SolutionStream.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Ленивое решение для большого числа дисков (три стержня).
+Оптимальный путь между любыми двумя конфигурациями раскладывается за O(n)
+на последовательность переносов полных башен (по той же рекурсии, что и exact_distance).
+Ход номер i внутри переноса башни вычисляется по двоичной записи i за O(1),
+поэтому ходы выдаются по одному с постоянной памятью, а ход #k или срез ходов
+получается без генерации предыдущих - решение можно делить между исполнителями.
+"""
+
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+from Heuristics import check_three_rods, situation_to_positions, tower_distance
+from PackedState import ROD_NAMES
+
+# Перенос башни: (число дисков, откуда, куда)
+Piece = Tuple[int, int, int]
+
+
+def _third(first: int, second: int) -> int:
+    return 3 - first - second
+
+
+def tower_move(num_disks: int, source: int, destination: int, index: int) -> Tuple[int, int]:
+    """
+    Ход номер index (с нуля) при переносе башни из num_disks дисков с source на destination.
+    Канонический перенос со стержня 0: ход i (с единицы) идёт с (i & (i-1)) % 3 на ((i | (i-1)) + 1) % 3,
+    башня оказывается на стержне 2 при нечётном числе дисков и на стержне 1 при чётном.
+    """
+    step = index + 1
+    canonical_source = (step & (step - 1)) % 3
+    canonical_destination = ((step | (step - 1)) + 1) % 3
+    final = 2 if num_disks % 2 else 1
+    mapping = {0: source, final: destination, 3 - final: _third(source, destination)}
+    return mapping[canonical_source], mapping[canonical_destination]
+
+
+def _to_tower(positions: Sequence[int], top_disk: int, rod_idx: int) -> List[Piece]:
+    """Переносы башен, собирающие диски 1..top_disk из positions в башню на rod_idx (в порядке выполнения)."""
+    # Цель для каждого диска сверху вниз: совпавший диск не двигается, иначе меньшие уходят на третий стержень
+    mismatches = []
+    target = rod_idx
+    for disk in range(top_disk, 0, -1):
+        if positions[disk] != target:
+            next_target = _third(positions[disk], target)
+            mismatches.append((disk, positions[disk], target, next_target))
+            target = next_target
+    pieces = []
+    for disk, source, destination, smaller_rod in reversed(mismatches):
+        pieces.append((1, source, destination))
+        pieces.append((disk - 1, smaller_rod, destination))
+    return pieces
+
+
+def _reverse(pieces: List[Piece]) -> List[Piece]:
+    """Обратить последовательность: перенос башни A -> B становится B -> A."""
+    return [(size, destination, source) for size, source, destination in reversed(pieces)]
+
+
+class SolutionStream:
+    """
+    Оптимальное решение как ленивая последовательность ходов (source, destination).
+    Поддерживает итерацию, индексирование и срезы. Длина - в атрибуте length
+    (len() работает, пока она не превышает sys.maxsize).
+    """
+
+    def __init__(self, current_situation: Any, goal_situation: Any, num_disks: int,
+                 rod_names: Tuple[str, ...] = ROD_NAMES):
+        """
+        Args:
+            current_situation: Начальное состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+            num_disks: Количество дисков.
+            rod_names: Имена стержней для ходов.
+        """
+        if len(rod_names) != 3:
+            raise ValueError("SolutionStream строит решение только для трёх стержней.")
+        check_three_rods(current_situation, goal_situation)
+        self.num_disks = num_disks
+        self.rod_names = rod_names
+        self.pieces = self._plan(situation_to_positions(current_situation, num_disks),
+                                 situation_to_positions(goal_situation, num_disks))
+        # Накопленные длины для поиска куска по номеру хода
+        self._offsets = []
+        total = 0
+        for size, _, _ in self.pieces:
+            self._offsets.append(total)
+            total += (1 << size) - 1
+        self.length = total
+
+    def _plan(self, start: Sequence[int], goal: Sequence[int]) -> List[Piece]:
+        """Разложить путь на переносы башен (как в exact_distance: один или два хода наибольшего диска)."""
+        disk = self.num_disks
+        while disk > 0 and start[disk] == goal[disk]:
+            disk -= 1
+        if disk == 0:
+            return []
+
+        source, destination = start[disk], goal[disk]
+        auxiliary = _third(source, destination)
+        smaller = disk - 1
+        one_move = tower_distance(start, smaller, auxiliary) + 1 + tower_distance(goal, smaller, auxiliary)
+        two_moves = (tower_distance(start, smaller, destination) + 1 + ((1 << smaller) - 1) + 1
+                     + tower_distance(goal, smaller, source))
+
+        if one_move <= two_moves:
+            pieces = _to_tower(start, smaller, auxiliary) + [(1, source, destination)] \
+                + _reverse(_to_tower(goal, smaller, auxiliary))
+        else:
+            pieces = _to_tower(start, smaller, destination) + [(1, source, auxiliary), (smaller, destination, source),
+                                                               (1, auxiliary, destination)] \
+                + _reverse(_to_tower(goal, smaller, source))
+        return [piece for piece in pieces if piece[0] > 0]
+
+    def _named(self, move: Tuple[int, int]) -> Tuple[str, str]:
+        return self.rod_names[move[0]], self.rod_names[move[1]]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self.iter_range(0, self.length)
+
+    def iter_range(self, start: int, stop: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """Ходы с номерами [start, stop): переход к start за O(log n), далее по одному за O(1)."""
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return
+        piece_idx = bisect_right(self._offsets, start) - 1
+        index = start - self._offsets[piece_idx]
+        position = start
+        for size, source, destination in islice(self.pieces, piece_idx, None):
+            piece_length = (1 << size) - 1
+            while index < piece_length:
+                if position >= stop:
+                    return
+                yield self._named(tower_move(size, source, destination, index))
+                index += 1
+                position += 1
+            index = 0
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Tuple[str, str], List[Tuple[str, str]]]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("Номер хода вне решения.")
+        piece_idx = bisect_right(self._offsets, key) - 1
+        size, source, destination = self.pieces[piece_idx]
+        return self._named(tower_move(size, source, destination, key - self._offsets[piece_idx]))
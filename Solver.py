@@ -11,45 +11,316 @@ Solver.py
 1. Поиск в глубину
 2. Поиск в ширину
 3. Ветви и границы
+4. Двунаправленный поиск в ширину
+5. Итеративное углубление (IDA* / IDDFS)
+6. Векторизованный поиск в ширину (NumPy)
+7. Параллельный поиск в ширину (несколько процессов)
+8. Поиск в ширину во внешней памяти (уровни на диске)
 """
 
 import heapq
+import os
 from collections import deque
-from ctypes.wintypes import MAX_PATH
-from typing import List, Tuple, Optional, Any, Set
-
-from Node import Node
-from Tree import Tree
+from typing import List, Tuple, Optional, Any, Set, Iterable, Iterator
+
+from Budget import BudgetRun, SearchBudget, SearchOutcome, load_checkpoint
+from DistanceTable import DistanceTable
+from ExternalBFS import ExternalBFS, ExternalBFSConfig
+from HanoiTower import child_counts, target_counts
+from Heuristics import Heuristic, check_three_rods, exact_distance, situation_to_positions
+from MoveCodec import PackedMoves, encode_moves
+from PackedState import get_engine, rod_names_for
+from ParallelBFS import solve_parallel
+from RankedSet import RankedBitset, RankedCostArray
+from SearchStats import Observer, SearchMonitor, SearchStats
+from SolutionStream import SolutionStream
+from Symmetry import SymmetryReducer, get_reducer
+from Tree import ArrayTree
+from VectorBFS import solve_vectorized
 
 
 class Solver:
     """Универсальный решатель на основе поиска в глубину (а можно и в ширину) для задач с состояниями."""
     MAX_PATH = float('inf')
 
-    def __init__(self, max_depth: int = 7, num_disks=3, gradient=False):
+    def __init__(self, max_depth: int = 7, num_disks=3, gradient=False, packed=False,
+                 heuristic: Optional[Heuristic] = None, ranked_visited=False, num_rods=3, symmetry=False):
+        """
+        Args:
+            max_depth: Максимальная глубина поиска.
+            num_disks: Количество дисков.
+            gradient: Упорядочивать ли ходы по оценке состояния.
+            packed: Искать на упакованных целых состояниях (PackedHanoi) вместо кортежей.
+            heuristic: Эвристика для ветвей и границ (None - встроенная _heuristic).
+            ranked_visited: Хранить посещённые состояния в битовой карте / массиве по рангу вместо set / dict.
+            num_rods: Количество стержней (для packed=True; кортежные ситуации несут его сами).
+            symmetry: Не двигать один диск дважды подряд и склеивать состояния, симметричные
+                относительно цели (solve, solve_wide, ветви и границы; поиск идёт на упакованных состояниях).
+        """
+        if ranked_visited and num_rods != 3:
+            raise ValueError("ranked_visited (ранг в троичной системе) поддерживает только три стержня.")
         self.max_depth = max_depth
         self.num_disks = num_disks
         self.gradient = gradient
+        self.packed = packed
+        self.heuristic = heuristic
+        self.ranked_visited = ranked_visited
+        self.num_rods = num_rods
+        self.symmetry = symmetry
+        self._distance_table: Optional[DistanceTable] = None
+        self._monitor: Optional[SearchMonitor] = None  # Сборщик статистики текущего запуска
+        self._run: Optional[BudgetRun] = None  # Бюджет текущего запуска (solve_anytime)
+        self._target = tuple(range(num_disks, 0, -1))  # Цель: (n, ..., 1) на C
+
+    def _prepare(self, current_situation: Any, goal_situation: Any, get_next_situations: callable) -> \
+            Tuple[Any, Any, callable]:
+        """
+        Подготовить входные данные к поиску.
+        При packed=True (или symmetry=True) кортежи упаковываются в целые числа, а генератор ходов
+        заменяется на PackedHanoi.get_next_situations (ходы остаются прежними кортежами).
+        """
+        if not (self.packed or self.symmetry):
+            return current_situation, goal_situation, get_next_situations
+        engine = get_engine(self.num_disks, rod_names_for(self.num_rods))
+        if not isinstance(current_situation, int):
+            current_situation = engine.encode(current_situation)
+        if not isinstance(goal_situation, int):
+            goal_situation = engine.encode(goal_situation)
+        return current_situation, goal_situation, engine.get_next_situations
+
+    def _require_three_rods(self, name: str) -> None:
+        """Отказать, если метод рассчитан только на три стержня, а решатель настроен на другое число."""
+        if self.num_rods != 3:
+            raise ValueError(f"{name} работает только с тремя стержнями (num_rods={self.num_rods}).")
+
+    def _encode(self, situation: Any) -> int:
+        """Упаковать состояние движком на self.num_rods стержней (числа возвращаются как есть)."""
+        if isinstance(situation, int):
+            return situation
+        return get_engine(self.num_disks, rod_names_for(self.num_rods)).encode(situation)
+
+    def _reducer(self, goal_situation: Any) -> Optional[SymmetryReducer]:
+        """SymmetryReducer для цели при symmetry=True, иначе None."""
+        if not self.symmetry:
+            return None
+        return get_reducer(self.num_disks, goal_situation, rod_names_for(self.num_rods))
+
+    def _instrument(self, get_next_situations: callable, reducer: Optional[SymmetryReducer],
+                    frontier_size: callable, visited_size: callable, accepted: callable) -> Tuple[callable, callable]:
+        """
+        Подключить монитор статистики, если он задан.
+        Returns:
+            (генератор ходов, генератор ходов SymmetryReducer или None) - обёрнутые при наличии монитора.
+        """
+        reduced_successors = reducer.get_next_situations if reducer is not None else None
+        monitor = self._monitor
+        if monitor is None:
+            return get_next_situations, reduced_successors
+        monitor.attach(frontier_size, visited_size, accepted)
+        if reduced_successors is not None:
+            reduced_successors = monitor.wrap_successors(reduced_successors)
+        return monitor.wrap_successors(get_next_situations), reduced_successors
+
+    def solve_with_stats(self, strategy: str, current_situation: Any, goal_situation: Any,
+                         get_next_situations: Optional[callable] = None, observer: Optional[Observer] = None,
+                         every: int = 1, trace_memory: bool = False) -> Tuple[Optional[List[Tuple[str, str]]],
+                                                                              SearchStats]:
+        """
+        Решить задачу и собрать статистику поиска.
+        Счётчики узлов ведут solve, solve_wide, solve_bidirectional, solve_branches_and_bounds
+        и solve_iterative_deepening; solve_vectorized и solve_external учитывают раскрытия пачками
+        (по уровню / блоку чтения), поэтому наблюдатель вызывается реже, чем раз в every раскрытий.
+        Для остальных стратегий заполняются только время, память и длина пути, наблюдатель не вызывается.
+        Args:
+            strategy: Имя метода ('solve', 'solve_wide', ...).
+            current_situation: Текущее состояние.
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция генерации ходов.
+            observer: Функция, вызываемая с текущей статистикой.
+            every: Вызывать наблюдателя раз в every раскрытий.
+            trace_memory: Измерять пиковую память через tracemalloc.
+        Returns:
+            (список шагов или None, SearchStats)
+        """
+        monitor = SearchMonitor(strategy, observer, every, trace_memory)
+        self._monitor = monitor
+        monitor.start()
+        try:
+            path = getattr(self, strategy)(current_situation, goal_situation, get_next_situations)
+        finally:
+            self._monitor = None
+        return path, monitor.finish(path)
+
+    def solve_anytime(self, strategy: str, current_situation: Any, goal_situation: Any,
+                      get_next_situations: Optional[callable] = None, budget: Optional[SearchBudget] = None,
+                      resume: Optional[str] = None) -> SearchOutcome:
+        """
+        Решить задачу в пределах бюджета (solve, solve_wide, solve_branches_and_bounds).
+        При исчерпании бюджета возвращается лучший частичный результат: для ветвей и границ -
+        найденное решение (если есть) и нижняя граница, для остальных - путь к состоянию
+        с наименьшей оценкой. Если задан файл контрольной точки, в него пишутся фронт,
+        посещённые состояния и лучшее решение, и поиск можно продолжить через resume.
+        Args:
+            strategy: Имя метода.
+            current_situation: Текущее состояние.
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция генерации ходов.
+            budget: Пределы ресурсов (None - без ограничений).
+            resume: Файл контрольной точки, с которой продолжить.
+        Returns:
+            SearchOutcome.
+        """
+        if strategy not in ('solve', 'solve_wide', 'solve_branches_and_bounds'):
+            raise ValueError(f"Стратегия {strategy} не поддерживает бюджет.")
+        budget = budget or SearchBudget()
+        engine = get_engine(self.num_disks, rod_names_for(self.num_rods))
+        meta = dict(strategy=strategy, num_disks=self.num_disks, num_rods=self.num_rods, max_depth=self.max_depth,
+                    gradient=self.gradient, packed=self.packed, symmetry=self.symmetry,
+                    ranked_visited=self.ranked_visited,
+                    heuristic=type(self.heuristic).__name__ if self.heuristic is not None else None,
+                    start=current_situation if isinstance(current_situation, int) else engine.encode(current_situation),
+                    goal=goal_situation if isinstance(goal_situation, int) else engine.encode(goal_situation))
+        run = BudgetRun(budget, meta, load_checkpoint(resume) if resume is not None else None)
+        self._run = run
+        try:
+            path = getattr(self, strategy)(current_situation, goal_situation, get_next_situations)
+        finally:
+            self._run = None
+        reached_goal = path is not None and (run.exhausted is None or run.reached_goal)
+        return SearchOutcome(path, reached_goal, run.exhausted, run.lower_bound, run.expanded,
+                             budget.checkpoint_path if run.checkpoint_written else None)
+
+    def _best_partial(self, goal_situation: Any, candidates: Iterable[Tuple[Any, Any]]) -> Optional[Any]:
+        """Из пар (состояние, путь или узел) выбрать ту, чьё состояние ближе всего к цели по оценке."""
+        estimate = self._estimator(goal_situation)
+        best = min(candidates, key=lambda candidate: estimate(candidate[0]), default=None)
+        return None if best is None else best[1]
+
+    def _new_visited(self, root_situation: Any) -> Any:
+        """Создать множество посещённых состояний (set или RankedBitset)."""
+        if self.ranked_visited:
+            return RankedBitset(self.num_disks, (root_situation,))
+        return {root_situation}
+
+    def _new_costs(self, root_situation: Any) -> Any:
+        """Создать словарь состояние -> g (dict или RankedCostArray)."""
+        costs = RankedCostArray(self.num_disks, self.max_depth) if self.ranked_visited else {}
+        costs[root_situation] = 0
+        return costs
 
     def _heuristic(self, situation):
         """
         Эвристика: насколько состояние "далеко" от цели.
         Меньше = лучше (ближе к цели).
         """
-        a, b, c = situation
-        target = tuple(range(self.num_disks, 0, -1))  # Цель: (3,2,1) на C
+        if isinstance(situation, int):
+            return self._heuristic_from_counts(
+                get_engine(self.num_disks, rod_names_for(self.num_rods)).target_counts(situation))
+
+        *other_rods, c = situation
+        target = self._target
 
-        # Сколько дисков уже правильно на C (снизу вверх)
+        # Сколько дисков уже правильно на C (последнем стержне, снизу вверх)
         correct = sum(1 for i, d in enumerate(c) if i < len(target) and d == target[i])
 
         # Каждый "неправильный" диск требует минимум 1 хода
         misplaced = self.num_disks - correct
 
-        # Диски на A и B — тоже плохо (штраф)
-        penalty = len(a) + len(b)
+        # Диски на остальных стержнях — тоже плохо (штраф)
+        penalty = sum(len(rod) for rod in other_rods)
 
         return misplaced + 0.1 * penalty
 
+    def _heuristic_from_counts(self, counts: Tuple[int, int]) -> float:
+        """_heuristic по счётчикам target_counts (правильно уложенные, всего на целевом стержне)."""
+        correct, on_target = counts
+        return (self.num_disks - correct) + 0.1 * (self.num_disks - on_target)
+
+    def _estimator(self, goal_situation: Any) -> callable:
+        """Вернуть функцию оценки situation -> h для заданной цели."""
+        if self.heuristic is None:
+            return self._heuristic
+        heuristic = self.heuristic
+        return lambda situation: heuristic.estimate(situation, goal_situation)
+
+    def distance(self, current_situation: Any, goal_situation: Any) -> int:
+        """
+        Точное оптимальное число ходов между двумя конфигурациями (три стержня) без поиска, O(n).
+        Args:
+            current_situation: Текущее состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+        Returns:
+            Длина кратчайшего решения.
+        """
+        self._require_three_rods('distance')
+        check_three_rods(current_situation, goal_situation)
+        return exact_distance(situation_to_positions(current_situation, self.num_disks),
+                              situation_to_positions(goal_situation, self.num_disks), self.num_disks)
+
+    def solve_stream(self, current_situation: Any, goal_situation: Any) -> SolutionStream:
+        """
+        Оптимальное решение без поиска и без хранения ходов (три стержня).
+        Ходы выдаются по одному, ход #k и срезы доступны напрямую - см. SolutionStream.
+        Args:
+            current_situation: Текущее состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+        Returns:
+            Ленивая последовательность ходов.
+        """
+        self._require_three_rods('solve_stream')
+        return SolutionStream(current_situation, goal_situation, self.num_disks)
+
+    def solve_encoded(self, strategy: str, current_situation: Any, goal_situation: Any,
+                      get_next_situations: Optional[callable] = None) -> Optional[PackedMoves]:
+        """
+        Решить выбранной стратегией и вернуть ходы в упакованном формате (3 бита на ход, см. MoveCodec).
+        Args:
+            strategy: Имя метода решателя ('solve_wide', 'solve_branches_and_bounds', 'solve_stream', ...).
+            current_situation: Текущее состояние.
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция генерации ходов (для стратегий поиска).
+        Returns:
+            Упакованные ходы или None, если решение не найдено.
+        """
+        if strategy == 'solve_stream':
+            moves = self.solve_stream(current_situation, goal_situation)
+        else:
+            moves = getattr(self, strategy)(current_situation, goal_situation, get_next_situations)
+        return None if moves is None else encode_moves(moves)
+
+    def get_distance_table(self, goal_situation: Any, table_path: Optional[str] = None) -> DistanceTable:
+        """
+        Вернуть таблицу расстояний до цели (кешируется в решателе).
+        Если table_path задан и файл существует - таблица загружается, иначе строится и сохраняется туда.
+        """
+        self._require_three_rods('get_distance_table')
+        goal = self._encode(goal_situation)
+        table = self._distance_table
+        if table is None or table.goal != goal:
+            if table_path and os.path.exists(table_path):
+                table = DistanceTable.load(table_path)
+                if table.goal != goal or table.num_disks != self.num_disks:
+                    raise ValueError(f"Таблица {table_path} построена для другой цели.")
+            else:
+                table = DistanceTable.build(self.num_disks, goal)
+                if table_path:
+                    table.save(table_path)
+            self._distance_table = table
+        return table
+
+    def solve_batch(self, situations: Iterable[Any], goal_situation: Any, table_path: Optional[str] = None) -> \
+            Iterator[Optional[List[Tuple[str, str]]]]:
+        """
+        Решить пакет начальных состояний для одной цели по таблице расстояний, без поиска.
+        Args:
+            situations: Начальные состояния.
+            goal_situation: Общее целевое состояние.
+            table_path: Файл для сохранения / загрузки таблицы.
+        Returns:
+            Итератор списков шагов (None для недостижимых состояний).
+        """
+        return self.get_distance_table(goal_situation, table_path).solve_batch(situations)
+
     def solve(self, current_situation: Any, goal_situation: Any, get_next_situations: callable) -> Optional[
         List[Tuple[str, str]]]:
         """
@@ -61,15 +332,33 @@ class Solver:
         Returns:
             Список шагов (например, (source, destination)) или None, если решение не найдено.
         """
-        # Стек содержит: (situation, depth, move), где move — последний ход (или None для начального состояния)
-        # stack = [(current_situation, 0, None)]
-        stack = [(current_situation, [], 0)]
-        visited = {current_situation}  # Множество посещённых состояний
+        current_situation, goal_situation, get_next_situations = self._prepare(
+            current_situation, goal_situation, get_next_situations)
+        reducer = self._reducer(goal_situation)
+        canonical = reducer.canonical if reducer is not None else None
+        run = self._run
+        if run is not None and run.resume is not None:
+            stack, visited = run.resume['stack'], run.resume['visited']
+        else:
+            # Стек содержит: (situation, depth, move), где move — последний ход (или None для начального состояния)
+            # stack = [(current_situation, 0, None)]
+            # previous - состояние до последнего хода (нужно только для отсечения ходов)
+            stack = [(current_situation, [], 0, None)]
+            # Множество посещённых состояний
+            visited = self._new_visited(current_situation if canonical is None else canonical(current_situation))
+        if run is not None:
+            run.attach(lambda: dict(stack=stack, visited=visited))
+        get_next_situations, reduced_successors = self._instrument(
+            get_next_situations, reducer, lambda: len(stack), lambda: len(visited), lambda: len(visited) - 1)
         # path = []  # Текущий путь (список ходов)
 
         while stack:
+            # Бюджет исчерпан - лучший из путей на стеке
+            if run is not None and run.tick(len(visited)):
+                return self._best_partial(goal_situation, ((entry[0], entry[1]) for entry in stack))
+
             # situation, depth, move = stack.pop()
-            situation, path, depth = stack.pop()
+            situation, path, depth, previous = stack.pop()
 
             # Если это не начальное состояние, добавляем ход в путь
             # if move is not None:
@@ -89,12 +378,16 @@ class Solver:
 
             # Получаем следующие возможные состояния
             any_moves_added = False
-            next_situations = get_next_situations(situation, num_disks=self.num_disks, gradient=self.gradient)
+            if reducer is None:
+                next_situations = get_next_situations(situation, num_disks=self.num_disks, gradient=self.gradient)
+            else:
+                next_situations = reduced_successors(situation, previous, self.gradient)
             for next_situation, next_move in next_situations:
-                if next_situation not in visited:
-                    visited.add(next_situation)
+                key = next_situation if canonical is None else canonical(next_situation)
+                if key not in visited:
+                    visited.add(key)
                     new_path = path + [next_move]  # копия пути + новый ход
-                    stack.append((next_situation, new_path, depth + 1))
+                    stack.append((next_situation, new_path, depth + 1, situation))
                     # stack.append((next_situation, depth + 1, next_move))
                     any_moves_added = True
 
@@ -116,35 +409,190 @@ class Solver:
         Returns:
             Список шагов (например, (source, destination)) или None, если решение не найдено.
         """
-        # Инициализация дерева и очереди
-        tree = Tree(current_situation)
-        queue = deque([tree.root])  # Храним узлы дерева
-        visited = {current_situation}  # Множество посещённых состояний
+        current_situation, goal_situation, get_next_situations = self._prepare(
+            current_situation, goal_situation, get_next_situations)
+        reducer = self._reducer(goal_situation)
+        canonical = reducer.canonical if reducer is not None else None
+        run = self._run
+        if run is not None and run.resume is not None:
+            tree, queue, visited = run.resume['tree'], deque(run.resume['queue']), run.resume['visited']
+        else:
+            # Инициализация дерева и очереди
+            tree = ArrayTree(current_situation)
+            queue = deque([tree.ROOT])  # Храним индексы узлов дерева
+            # Множество посещённых состояний
+            visited = self._new_visited(current_situation if canonical is None else canonical(current_situation))
+        if run is not None:
+            run.attach(lambda: dict(tree=tree, queue=list(queue), visited=visited))
+        get_next_situations, reduced_successors = self._instrument(
+            get_next_situations, reducer, lambda: len(queue), lambda: len(visited), lambda: len(visited) - 1)
 
         while queue:
+            # Бюджет исчерпан: все пути короче глубины первого узла очереди уже проверены
+            if run is not None and run.tick(len(tree)):
+                run.lower_bound = tree.depth(queue[0])
+                return tree.get_path_to_node(self._best_partial(
+                    goal_situation, ((tree.situation(node), node) for node in range(len(tree)))))
+
             current_node = queue.popleft()
+            situation = tree.situation(current_node)
 
             # Достигнута целевая ситуация?
-            if current_node.situation == goal_situation:
+            if situation == goal_situation:
                 return tree.get_path_to_node(current_node)
 
             # Проверка на превышение максимальной глубины
-            if current_node.depth >= self.max_depth:
+            if tree.depth(current_node) >= self.max_depth:
                 continue
 
             # Получаем следующие возможные состояния
-            next_situations = get_next_situations(current_node.situation, num_disks=self.num_disks,
-                                                  gradient=self.gradient)
+            if reducer is None:
+                next_situations = get_next_situations(situation, num_disks=self.num_disks, gradient=self.gradient)
+            else:
+                next_situations = reduced_successors(situation, self._parent_situation(tree, current_node),
+                                                     self.gradient)
             for next_situation, move in next_situations:
-                if next_situation not in visited:
+                key = next_situation if canonical is None else canonical(next_situation)
+                if key not in visited:
                     # Создаём новый узел с увеличенной глубиной
-                    new_node = Node(next_situation, parent=current_node, move=move, depth=current_node.depth + 1)
-                    current_node.add_child(new_node)
-                    visited.add(next_situation)
+                    new_node = tree.add_node(next_situation, current_node, move)
+                    visited.add(key)
                     queue.append(new_node)
 
         return None
 
+    def solve_bidirectional(self, current_situation: Any, goal_situation: Any, get_next_situations: callable) -> \
+            Optional[List[Tuple[str, str]]]:
+        """
+        Ищет решение двунаправленным поиском в ширину: фронты растут от начала и от цели,
+        на каждом шаге раскрывается целый уровень меньшего фронта.
+        Предполагается, что ходы обратимы: ход (source, destination) отменяется ходом (destination, source).
+        После встречи фронтов путь восстанавливается так же, как его нашёл бы solve_wide
+        (см. _first_shortest_path), поэтому обе стратегии возвращают одинаковый список ходов.
+        Args:
+            current_situation: Текущее состояние (например, кортежи дисков для A, B, C).
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция, возвращающая список (next_situation, move) для возможных ходов.
+        Returns:
+            Кратчайший список шагов (тот же, что и у solve_wide) или None, если решение не найдено.
+        """
+        current_situation, goal_situation, get_next_situations = self._prepare(
+            current_situation, goal_situation, get_next_situations)
+        if current_situation == goal_situation:
+            return []
+
+        forward_tree = ArrayTree(current_situation)
+        backward_tree = ArrayTree(goal_situation)
+        # Для каждой стороны: посещённые состояния -> индекс узла и текущий фронт (один уровень)
+        forward_visited = {current_situation: forward_tree.ROOT}
+        backward_visited = {goal_situation: backward_tree.ROOT}
+        forward_frontier = [forward_tree.ROOT]
+        backward_frontier = [backward_tree.ROOT]
+        forward_depth = backward_depth = 0
+        successors = get_next_situations  # Для восстановления пути - без учёта в статистике
+        get_next_situations, _ = self._instrument(
+            get_next_situations, None, lambda: len(forward_frontier) + len(backward_frontier),
+            lambda: len(forward_visited) + len(backward_visited), lambda: len(forward_tree) + len(backward_tree) - 2)
+
+        while forward_frontier and backward_frontier and forward_depth + backward_depth < self.max_depth:
+            # Раскрываем меньший фронт
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, visited, other_visited = forward_frontier, forward_visited, backward_visited
+                tree = forward_tree
+            else:
+                frontier, visited, other_visited = backward_frontier, backward_visited, forward_visited
+                tree = backward_tree
+
+            met = False
+            next_frontier = []
+            for current_node in frontier:
+                next_situations = get_next_situations(tree.situation(current_node), num_disks=self.num_disks,
+                                                      gradient=self.gradient)
+                for next_situation, move in next_situations:
+                    if next_situation in visited:
+                        continue
+                    new_node = tree.add_node(next_situation, current_node, move)
+                    visited[next_situation] = new_node
+                    next_frontier.append(new_node)
+
+                    # Фронты встретились?
+                    if next_situation in other_visited:
+                        met = True
+
+            if expand_forward:
+                forward_frontier = next_frontier
+                forward_depth += 1
+            else:
+                backward_frontier = next_frontier
+                backward_depth += 1
+
+            # Уровень раскрыт полностью: до него фронты не встречались, значит длина решения
+            # ровно forward_depth + backward_depth
+            if met:
+                return self._first_shortest_path(
+                    current_situation, successors,
+                    lambda situation: forward_tree.depth(forward_visited[situation])
+                    if situation in forward_visited else None, forward_depth,
+                    lambda situation: backward_tree.depth(backward_visited[situation])
+                    if situation in backward_visited else None, backward_depth)
+
+        return None
+
+    @staticmethod
+    def _parent_situation(tree: ArrayTree, node: int) -> Optional[Any]:
+        """Состояние родителя узла (None для корня)."""
+        return tree.situation(tree.parents[node]) if node != tree.ROOT else None
+
+    def _first_shortest_path(self, start: Any, get_next_situations: callable, forward_distance: callable,
+                             forward_depth: int, backward_distance: callable, backward_depth: int) -> \
+            List[Tuple[str, str]]:
+        """
+        Кратчайший путь, который вернул бы solve_wide: первый в порядке ходов get_next_situations.
+        Очередь solve_wide упорядочена именно так, поэтому её путь - лексикографически наименьший
+        среди кратчайших. Точные расстояния известны из фронтов: от начала - до forward_depth,
+        до цели - до backward_depth, и любой кратчайший путь проходит через состояние, у которого
+        они равны forward_depth и backward_depth.
+        Args:
+            start: Начальное состояние.
+            get_next_situations: Функция ходов (та же, что при поиске).
+            forward_distance: Расстояние от начала до состояния или None, если оно не посещено.
+            forward_depth: Число раскрытых уровней прямого фронта.
+            backward_distance: Расстояние от состояния до цели или None.
+            backward_depth: Число раскрытых уровней обратного фронта.
+        """
+        def successors(situation: Any) -> Any:
+            return iter(get_next_situations(situation, num_disks=self.num_disks, gradient=self.gradient))
+
+        # Прямая часть: перебор в глубину по слоям прямого фронта до состояния встречи,
+        # тупики запоминаются (стек вместо рекурсии - путь может быть длинным)
+        situations, path, pending = [start], [], [successors(start)] if forward_depth else []
+        dead = set()
+        while len(path) < forward_depth:
+            depth = len(path) + 1
+            for next_situation, move in pending[-1]:
+                if next_situation in dead or forward_distance(next_situation) != depth:
+                    continue
+                if depth == forward_depth and backward_distance(next_situation) != backward_depth:
+                    continue
+                situations.append(next_situation)
+                path.append(move)
+                pending.append(successors(next_situation))
+                break
+            else:
+                dead.add(situations.pop())
+                path.pop()
+                pending.pop()
+        # Обратная часть: от состояния встречи каждый ход уменьшает расстояние до цели на единицу
+        situation = situations[-1]
+        for remaining in range(backward_depth - 1, -1, -1):
+            for next_situation, move in successors(situation):
+                if backward_distance(next_situation) == remaining:
+                    situation = next_situation
+                    path.append(move)
+                    break
+        return path
+
     def solve_branches_and_bounds(self, current_situation: Any, goal_situation: Any, get_next_situations: callable) -> \
             Optional[List[Tuple[str, str]]]:
         """
@@ -156,15 +604,55 @@ class Solver:
         Returns:
             Список шагов (например, (source, destination)) или None, если решение не найдено.
         """
-        # Инициализация дерева и очереди
-        tree = Tree(current_situation)
-        queue = []  # храним узлы в приоритетной очереди
-        start_h = self._heuristic(current_situation)
-        heapq.heappush(queue, (start_h, 0, tree.root))  # (f, g, node) упорядочиваем узлы
-
-        visited = {current_situation: 0}  # Множество посещённых состояний
-        best_cost = MAX_PATH  # длина кратчайшего пути
-        goal_node = None  # узел с целевой ситуацией
+        current_situation, goal_situation, get_next_situations = self._prepare(
+            current_situation, goal_situation, get_next_situations)
+        reducer = self._reducer(goal_situation)
+        canonical = reducer.canonical if reducer is not None else None
+        estimate = self._estimator(goal_situation)
+        if self._monitor is not None:
+            estimate = self._monitor.wrap_heuristic(estimate)
+        run = self._run
+        if run is not None and run.resume is not None:
+            tree, queue, visited = run.resume['tree'], run.resume['queue'], run.resume['visited']
+            best_cost, goal_node = run.resume['best_cost'], run.resume['goal_node']
+        else:
+            # Инициализация дерева и очереди
+            tree = ArrayTree(current_situation)
+            queue = []  # храним узлы в приоритетной очереди
+            start_h = estimate(current_situation)
+            heapq.heappush(queue, (start_h, 0, tree.ROOT))  # (f, g, индекс узла) упорядочиваем узлы
+
+            # Посещённые (канонические при symmetry=True) состояния -> g
+            visited = self._new_costs(current_situation if canonical is None else canonical(current_situation))
+            best_cost = self.MAX_PATH  # длина кратчайшего пути
+            goal_node = None  # узел с целевой ситуацией
+        if run is not None:
+            run.attach(lambda: dict(tree=tree, queue=queue, visited=visited, best_cost=best_cost, goal_node=goal_node))
+        get_next_situations, reduced_successors = self._instrument(
+            get_next_situations, reducer, lambda: len(queue), lambda: len(visited), lambda: len(tree) - 1)
+        # Встроенная эвристика без symmetry: счётчики target_counts ребёнка получаются из счётчиков родителя
+        # и хода за O(1), и h не пересчитывается с нуля. node_counts хранит их для узлов в очереди
+        # (после возобновления недостающие считаются заново)
+        node_counts = None
+        scored_successors = None
+        if self.heuristic is None and reducer is None:
+            node_counts = {}
+            if self.packed:
+                engine = get_engine(self.num_disks, rod_names_for(self.num_rods))
+                count_situation = engine.target_counts
+                # Упакованные преемники приходят уже со счётчиками
+                scored_successors = engine.scored_successors
+                if self._monitor is not None:
+                    scored_successors = self._monitor.wrap_successors(scored_successors)
+            else:
+                count_situation = lambda situation: target_counts(situation, self.num_disks)
+                # Кортежные ситуации несут число стержней сами (self.num_rods - только для упаковки)
+                num_rods = len(current_situation)
+                rod_index = {name: idx for idx, name in enumerate(rod_names_for(num_rods))}
+        heuristic_from_counts = self._heuristic_from_counts
+        if self._monitor is not None:
+            # h по счётчикам учитывается в heuristic_calls / heuristic_time так же, как вызовы estimate
+            heuristic_from_counts = self._monitor.wrap_heuristic(heuristic_from_counts)
 
         # g - текущее количество шагов от начального состояния,
         # для ханойской башни где каждый шаг равноценный - бесмысленно,
@@ -173,14 +661,26 @@ class Solver:
         # h - оценочное количество шагов до целевого состояния
         # f = g + h
         while queue:
+            # Бюджет исчерпан: лучшее найденное решение и нижняя граница по очереди
+            if run is not None and run.tick(len(tree)):
+                run.lower_bound = min(queue[0][0], best_cost)
+                if goal_node is not None:
+                    run.reached_goal = True
+                    return tree.get_path_to_node(goal_node)
+                return tree.get_path_to_node(self._best_partial(
+                    goal_situation, ((tree.situation(node), node) for node in range(len(tree)))))
+
             f, g, current_node = heapq.heappop(queue)
+            situation = tree.situation(current_node)
+            if node_counts is not None:
+                counts = node_counts.pop(current_node, None)
 
             # Если уже нашли путь короче — пропускаем
-            if g > visited.get(current_node.situation, MAX_PATH):
+            if g > visited.get(situation if canonical is None else canonical(situation), self.MAX_PATH):
                 continue
 
             # Достигнута целевая ситуация? Если да, а вдруг есть путь короче?
-            if current_node.situation == goal_situation:
+            if situation == goal_situation:
                 if g < best_cost:
                     best_cost = g
                     goal_node = current_node
@@ -188,35 +688,180 @@ class Solver:
                 continue
 
             # если f >= лучший_полный_путь - отбрасываем
-            if best_cost != MAX_PATH and f >= best_cost:
+            if best_cost != self.MAX_PATH and f >= best_cost:
                 continue
 
             # Проверка на превышение максимальной глубины
             if g >= self.max_depth:
                 continue
 
+            if node_counts is not None and counts is None:
+                counts = count_situation(situation)
+
             # Получаем следующие возможные состояния
-            next_situations = get_next_situations(current_node.situation, num_disks=self.num_disks,
-                                                  gradient=self.gradient)
-            for next_situation, move in next_situations:
+            if scored_successors is not None:
+                next_situations = scored_successors(situation, self.gradient, counts=counts)
+            elif reducer is None:
+                next_situations = get_next_situations(situation, num_disks=self.num_disks, gradient=self.gradient)
+            else:
+                next_situations = reduced_successors(situation, self._parent_situation(tree, current_node),
+                                                     self.gradient)
+            for item in next_situations:
+                next_situation, move = item[0], item[1]
                 new_g = g + 1
+                key = next_situation if canonical is None else canonical(next_situation)
 
                 # Уже были с меньшим g?
-                if next_situation in visited and visited[next_situation] <= new_g:
+                if key in visited and visited[key] <= new_g:
                     continue
 
                 # Создаём новый узел с увеличенной глубиной
-                new_node = Node(next_situation, parent=current_node, move=move, depth=current_node.depth + 1)
-                current_node.add_child(new_node)
-                visited[next_situation] = new_g
-
-                h = self._heuristic(next_situation)
+                new_node = tree.add_node(next_situation, current_node, move)
+                visited[key] = new_g
+
+                if scored_successors is not None:
+                    next_counts = item[2]
+                    h = heuristic_from_counts(next_counts)
+                elif node_counts is not None:
+                    source, destination = rod_index[move[0]], rod_index[move[1]]
+                    next_counts = child_counts(counts, next_situation[destination][-1], source, destination,
+                                               self.num_disks, num_rods)
+                    h = heuristic_from_counts(next_counts)
+                else:
+                    h = estimate(next_situation)
                 f_new = new_g + h
 
                 # если f_new >= лучший_полный - отбрасываем
-                if best_cost != MAX_PATH and f_new >= best_cost:
+                if best_cost != self.MAX_PATH and f_new >= best_cost:
                     continue
 
                 heapq.heappush(queue, (f_new, new_g, new_node))
+                if node_counts is not None:
+                    node_counts[new_node] = next_counts
+
+        return tree.get_path_to_node(goal_node) if goal_node is not None else None
 
-        return tree.get_path_to_node(goal_node) if goal_node else None
+    def solve_iterative_deepening(self, current_situation: Any, goal_situation: Any,
+                                  get_next_situations: callable) -> Optional[List[Tuple[str, str]]]:
+        """
+        Ищет решение итеративным углублением (IDA*): поиск в глубину с порогом f = g + h,
+        который после каждой неудачной итерации поднимается до минимального превысившего его f.
+        Память O(глубина): один изменяемый стек ходов, повторы проверяются только вдоль текущего пути.
+        Эвристика берётся из self.heuristic; без неё получается обычный IDDFS (h = 0).
+        Args:
+            current_situation: Текущее состояние (например, кортежи дисков для A, B, C).
+            goal_situation: Целевое состояние.
+            get_next_situations: Функция, возвращающая список (next_situation, move) для возможных ходов.
+        Returns:
+            Список шагов (кратчайший при допустимой эвристике) или None, если решение не найдено.
+        """
+        current_situation, goal_situation, get_next_situations = self._prepare(
+            current_situation, goal_situation, get_next_situations)
+        if current_situation == goal_situation:
+            return []
+
+        estimate = self._estimator(goal_situation) if self.heuristic is not None else (lambda situation: 0)
+        bound = estimate(current_situation)
+        stack: List[Any] = []
+        on_path: Set[Any] = set()
+        pushed = 0  # Сколько ходов принято в путь (для статистики)
+        get_next_situations, _ = self._instrument(
+            get_next_situations, None, lambda: len(stack), lambda: len(on_path), lambda: pushed)
+
+        while bound <= self.max_depth:
+            next_bound = self.MAX_PATH
+            moves = []  # Текущий путь (ходы)
+            on_path = {current_situation}  # Состояния текущего пути
+            path_situations = [current_situation]
+            stack = [iter(get_next_situations(current_situation, num_disks=self.num_disks, gradient=self.gradient))]
+
+            while stack:
+                next_item = next(stack[-1], None)
+                if next_item is None:
+                    # Ветвь исчерпана - откатываем ход
+                    stack.pop()
+                    if moves:
+                        moves.pop()
+                        on_path.discard(path_situations.pop())
+                    continue
+
+                next_situation, move = next_item
+                if next_situation in on_path:
+                    continue
+                g = len(moves) + 1
+                f = g + estimate(next_situation)
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                if next_situation == goal_situation:
+                    moves.append(move)
+                    return moves
+                if g >= self.max_depth:
+                    continue
+
+                moves.append(move)
+                on_path.add(next_situation)
+                path_situations.append(next_situation)
+                pushed += 1
+                stack.append(iter(get_next_situations(next_situation, num_disks=self.num_disks,
+                                                      gradient=self.gradient)))
+
+            if next_bound == self.MAX_PATH:
+                break
+            bound = next_bound
+
+        return None
+
+    def solve_vectorized(self, current_situation: Any, goal_situation: Any,
+                         get_next_situations: Optional[callable] = None) -> Optional[List[Tuple[str, str]]]:
+        """
+        Ищет решение поиском в ширину по уровням, где весь фронт раскрывается векторными операциями NumPy.
+        Работает только для Ханойской башни: ходы считаются по упакованным состояниям,
+        поэтому get_next_situations не используется и оставлен для единообразия сигнатуры.
+        Args:
+            current_situation: Текущее состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+            get_next_situations: Не используется.
+        Returns:
+            Кратчайший список шагов или None, если решение не найдено.
+        """
+        progress = self._monitor.record_batch if self._monitor is not None else None
+        return solve_vectorized(self._encode(current_situation), self._encode(goal_situation), self.num_disks,
+                                self.max_depth, rod_names_for(self.num_rods), progress)
+
+    def solve_parallel(self, current_situation: Any, goal_situation: Any,
+                       get_next_situations: Optional[callable] = None, workers: Optional[int] = None) -> \
+            Optional[List[Tuple[str, str]]]:
+        """
+        Ищет решение поиском в ширину на нескольких процессах (см. ParallelBFS).
+        Работает на упакованных состояниях Ханойской башни, get_next_situations не используется.
+        Args:
+            current_situation: Текущее состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+            get_next_situations: Не используется.
+            workers: Количество рабочих процессов (по умолчанию - число ядер).
+        Returns:
+            Тот же список шагов, что и у solve_wide, или None, если решение не найдено.
+        """
+        return solve_parallel(self._encode(current_situation), self._encode(goal_situation), self.num_disks,
+                              self.max_depth, workers, self.gradient, rod_names_for(self.num_rods))
+
+    def solve_external(self, current_situation: Any, goal_situation: Any,
+                       get_next_situations: Optional[callable] = None,
+                       config: Optional[ExternalBFSConfig] = None) -> Optional[List[Tuple[str, str]]]:
+        """
+        Ищет решение поиском в ширину, уровни которого хранятся на диске (см. ExternalBFS).
+        Работает на упакованных состояниях Ханойской башни, get_next_situations не используется.
+        Число состояний по глубинам возвращает ExternalBFS.run.
+        Args:
+            current_situation: Текущее состояние (кортежи дисков или упакованное число).
+            goal_situation: Целевое состояние.
+            get_next_situations: Не используется.
+            config: Каталог и размеры буферов.
+        Returns:
+            Кратчайший список шагов или None, если решение не найдено.
+        """
+        progress = self._monitor.record_batch if self._monitor is not None else None
+        _, path = ExternalBFS(self.num_disks, config, rod_names_for(self.num_rods)).run(
+            self._encode(current_situation), self._encode(goal_situation), self.max_depth, progress)
+        return path
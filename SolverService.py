@@ -0,0 +1,302 @@
+"""
+SolverService.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Локальный asyncio-сервис вокруг Solver (TCP, по строке JSON на запрос и на ответ).
+Запрос - задача в формате BatchCLI плюс необязательные поля "id" (возвращается в ответе)
+и "deadline" (секунд на ответ). На одном соединении можно отправлять запросы подряд,
+ответы приходят по мере готовности. Конец входного потока считается отключением клиента:
+соединение нужно держать открытым, пока не получены все ответы.
+- Поиск выполняется в пуле процессов (BatchCLI.solve_spec).
+- Одинаковые запросы, пока первый ещё выполняется, не запускают новый поиск, а ждут общий результат.
+- Если все ожидающие клиента отключились или их сроки истекли, поиск отменяется:
+  ещё не начатый не запускается, начатый прерывается по событию отмены.
+- События отмены живут в процессе-менеджере, и каждое обращение к ним - обмен с этим процессом.
+  Поэтому они берутся из заранее созданного запаса и возвращаются в него после поиска,
+  а создание, установка и сброс выполняются вне цикла событий.
+- Задачи ждут свободного процесса в ограниченной очереди: когда она полна,
+  сервис перестаёт читать новые запросы, и давление передаётся клиенту через TCP.
+
+Запуск:
+    python SolverService.py --port 8765 --workers 4 --queue 64
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from BatchCLI import solve_spec
+
+# Поля запроса, не влияющие на результат поиска (не входят в ключ объединения)
+REQUEST_FIELDS = ('id', 'deadline')
+
+
+def _set_all(events: List[Any]) -> None:
+    """Установить события отмены (блокирует - вызывается вне цикла событий)."""
+    for event in events:
+        event.set()
+
+
+class Job:
+    """Один поиск, общий для всех одинаковых запросов."""
+
+    def __init__(self, key: str, spec: Dict[str, Any], cancel_event: Any):
+        self.key = key
+        self.spec = spec
+        self.cancel_event = cancel_event
+        self.cancelling: Optional[asyncio.Future] = None  # Установка cancel_event, выполняемая вне цикла
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.waiters = 0  # Сколько запросов ждут результат сейчас
+        self.joined = 0  # Сколько запросов присоединилось всего
+        self.started = False
+
+
+class SolverService:
+    """Сервис: очередь задач, пул процессов и объединение одинаковых запросов."""
+
+    def __init__(self, workers: Optional[int] = None, queue_size: int = 64, default_deadline: Optional[float] = None):
+        """
+        Args:
+            workers: Число процессов поиска (по умолчанию - число ядер).
+            queue_size: Сколько задач может ждать свободного процесса.
+            default_deadline: Срок ответа по умолчанию, с (None - без срока).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.default_deadline = default_deadline
+        self.in_flight: Dict[str, Job] = {}
+        self.stats = dict(requests=0, searches=0, coalesced=0, cancelled=0, timeouts=0)
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._events: List[Any] = []  # Свободные (сброшенные) события отмены
+        self._dispatchers: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Запустить пул процессов и раздатчиков задач."""
+        self._queue = asyncio.Queue(self.queue_size)
+        # Процессы пула создаются по требованию; при fork они унаследовали бы сокеты клиентов,
+        # и закрытие соединения не доходило бы до клиента. forkserver порождает их из чистого процесса.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        # События отмены, видимые рабочим процессам. Менеджер - отдельный процесс, его запуск
+        # и остановка ждут этот процесс, поэтому выполняются вне цикла событий
+        loop = asyncio.get_running_loop()
+        self._manager = await loop.run_in_executor(None, context.Manager)
+        self._events = await loop.run_in_executor(None, self._new_events, self.workers)
+        # Раздатчиков столько же, сколько процессов: очередь пула не копит задачи сверх очереди сервиса
+        for _ in range(self.workers):
+            self._dispatchers.add(asyncio.create_task(self._dispatch()))
+
+    async def close(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        events = [job.cancel_event for job in self.in_flight.values()]
+        await loop.run_in_executor(None, functools.partial(_set_all, events))
+        await loop.run_in_executor(None, functools.partial(self._pool.shutdown, wait=True, cancel_futures=True))
+        await loop.run_in_executor(None, self._manager.shutdown)
+
+    def _new_events(self, count: int) -> List[Any]:
+        """Создать события отмены в менеджере (блокирует - вызывается вне цикла событий)."""
+        return [self._manager.Event() for _ in range(count)]
+
+    async def _take_event(self) -> Any:
+        """Свободное событие отмены из запаса или новое, созданное вне цикла событий."""
+        if self._events:
+            return self._events.pop()
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(None, self._new_events, 1))[0]
+
+    async def _recycle(self, job: Job) -> None:
+        """Вернуть событие завершённого поиска в запас, сбросив его вне цикла событий."""
+        if job.cancelling is not None:
+            await job.cancelling  # Иначе установка могла бы выполниться уже после сброса
+        await asyncio.get_running_loop().run_in_executor(None, job.cancel_event.clear)
+        self._events.append(job.cancel_event)
+
+    @staticmethod
+    def _key(spec: Dict[str, Any]) -> str:
+        return json.dumps({k: v for k, v in spec.items() if k not in REQUEST_FIELDS}, sort_keys=True)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job: Job = await self._queue.get()
+            if job.waiters == 0:  # Все клиенты ушли, пока задача ждала в очереди
+                await self._recycle(job)
+                continue
+            job.started = True
+            self.stats['searches'] += 1
+            try:
+                result = await loop.run_in_executor(self._pool, solve_spec, job.spec, True, job.cancel_event)
+            except Exception as e:  # Ошибка задачи или пула не должна останавливать раздатчика
+                result = {'error': f"{type(e).__name__}: {e}"}
+            if self.in_flight.get(job.key) is job:
+                del self.in_flight[job.key]
+            if not job.future.done():
+                job.future.set_result(result)
+            await self._recycle(job)
+
+    def _release(self, job: Job) -> None:
+        """Клиент перестал ждать; последний ушедший отменяет поиск."""
+        job.waiters -= 1
+        if job.waiters > 0:
+            return
+        self.stats['cancelled'] += 1
+        if not job.future.done():  # После результата событие уже возвращается в запас
+            job.cancelling = asyncio.get_running_loop().run_in_executor(None, job.cancel_event.set)
+        if self.in_flight.get(job.key) is job:
+            del self.in_flight[job.key]
+
+    async def submit(self, spec: Dict[str, Any]) -> Job:
+        """Найти выполняющийся одинаковый поиск или поставить новый в очередь (ждёт места в ней)."""
+        key = self._key(spec)
+        job = self.in_flight.get(key)
+        if job is None:
+            cancel_event = await self._take_event()
+            job = self.in_flight.get(key)  # Пока событие создавалось, мог прийти такой же запрос
+            if job is not None:
+                self._events.append(cancel_event)
+        if job is not None:
+            self.stats['coalesced'] += 1
+            job.waiters += 1
+            job.joined += 1
+            return job
+        job = Job(key, spec, cancel_event)
+        self.in_flight[key] = job
+        job.waiters += 1
+        job.joined += 1
+        try:
+            # Ограниченная очередь: здесь возникает обратное давление.
+            # shield - задача попадёт в очередь, даже если первый клиент уйдёт раньше присоединившихся
+            await asyncio.shield(self._queue.put(job))
+        except asyncio.CancelledError:
+            self._release(job)
+            raise
+        return job
+
+    async def solve(self, spec: Dict[str, Any], queued: Optional[asyncio.Event] = None) -> Dict[str, Any]:
+        """
+        Обработать один запрос: результат или ошибка (в том числе по сроку).
+        Args:
+            spec: Запрос.
+            queued: Событие, устанавливаемое, когда запрос принят в очередь (или отклонён).
+        """
+        self.stats['requests'] += 1
+        deadline = spec.get('deadline', self.default_deadline)
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + float(deadline) if deadline is not None else None
+        try:
+            job = await asyncio.wait_for(self.submit(spec), deadline)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            return {'error': "Deadline: очередь переполнена."}
+        finally:
+            if queued is not None:
+                queued.set()
+        try:
+            timeout = None if expires is None else max(0.0, expires - loop.time())
+            result = await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            self._release(job)
+            return {'error': f"Deadline: ответ не получен за {deadline} с."}
+        except asyncio.CancelledError:
+            self._release(job)
+            raise
+        job.waiters -= 1
+        return dict(result, shared=job.joined > 1)
+
+    async def _respond(self, request_id: Any, spec: Optional[Dict[str, Any]], error: Optional[str],
+                       writer: asyncio.StreamWriter, lock: asyncio.Lock, queued: asyncio.Event) -> None:
+        response = {'id': request_id}
+        try:
+            response.update(await self.solve(spec, queued) if error is None else {'error': error})
+        except (ValueError, TypeError) as e:
+            response['error'] = f"{type(e).__name__}: {e}"
+        finally:
+            queued.set()
+        async with lock:
+            writer.write((json.dumps(response, ensure_ascii=False) + '\n').encode())
+            await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Соединение клиента: запросы читаются, пока есть место в очереди; при отключении - отмена."""
+        lock = asyncio.Lock()
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    spec = json.loads(line)
+                    if not isinstance(spec, dict):
+                        raise ValueError("Запрос должен быть объектом JSON.")
+                    request_id, error = spec.get('id'), None
+                except ValueError as e:
+                    spec, request_id, error = None, None, f"{type(e).__name__}: {e}"
+                queued = asyncio.Event()
+                task = asyncio.create_task(self._respond(request_id, spec, error, writer, lock, queued))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                # Пока запрос не принят в очередь, следующий не читаем
+                await queued.wait()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # Отключение: незавершённые запросы отменяются (и поиск, если его больше никто не ждёт)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, workers: Optional[int] = None, queue_size: int = 64,
+                default_deadline: Optional[float] = None, ready: Optional[asyncio.Event] = None) -> None:
+    """Запустить сервис и обслуживать соединения до отмены."""
+    service = SolverService(workers, queue_size, default_deadline)
+    await service.start()
+    # SIGTERM завершает сервис штатно: пул процессов и менеджер событий останавливаются
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    server = await asyncio.start_server(service.handle, host, port)
+    try:
+        async with server:
+            if ready is not None:
+                ready.set()
+            print(f"Сервис слушает {host}:{port}, процессов: {service.workers}", flush=True)
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальный сервис решения Ханойской башни")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help="Число процессов поиска")
+    parser.add_argument('--queue', type=int, default=64, help="Размер очереди задач")
+    parser.add_argument('--deadline', type=float, help="Срок ответа по умолчанию, с")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue, args.deadline))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Symmetry.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Сокращение пространства поиска для упакованных состояний Ханойской башни.
+1. Отсечение ходов: один и тот же диск не двигается два раза подряд
+   (второй ход либо отменяет первый, либо заменяется одним ходом), в том числе обратным ходом.
+2. Симметрия: стержни, пустые в цели, взаимозаменяемы - перестановка их имён не меняет
+   ни цель, ни расстояние до неё. Посещённые состояния хранятся в каноническом виде:
+   свободные стержни нумеруются по порядку появления на них дисков, от наибольшего к меньшим.
+   В дереве поиска остаются настоящие состояния и ходы, поэтому путь
+   восстанавливается в исходных именах стержней без обратного преобразования.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from PackedState import ROD_NAMES, get_engine
+
+
+class SymmetryReducer:
+    """Канонизация состояний и генерация ходов без повторного хода того же диска."""
+
+    def __init__(self, num_disks: int, goal_state: int, rod_names: Tuple[str, ...] = ROD_NAMES):
+        """
+        Args:
+            num_disks: Количество дисков.
+            goal_state: Упакованное целевое состояние.
+            rod_names: Имена стержней.
+        """
+        self.engine = engine = get_engine(num_disks, rod_names)
+        self.num_disks = num_disks
+        occupied = {engine.rod_of(goal_state, disk) for disk in range(1, num_disks + 1)}
+        # Стержни, пустые в цели; только их и можно переставлять
+        self.free_rods = tuple(rod for rod in range(engine.num_rods) if rod not in occupied)
+        self._free = frozenset(self.free_rods)
+        self.symmetric = len(self.free_rods) > 1
+
+    def canonical(self, state: int) -> int:
+        """Канонический представитель состояния относительно перестановок свободных стержней."""
+        if not self.symmetric:
+            return state
+        bits, mask, free = self.engine.bits_per_disk, self.engine.field_mask, self._free
+        mapping = {}
+        slots = iter(self.free_rods)
+        result = 0
+        for disk in range(self.num_disks, 0, -1):
+            shift = bits * (disk - 1)
+            rod = (state >> shift) & mask
+            if rod in free:
+                target = mapping.get(rod)
+                if target is None:
+                    target = mapping[rod] = next(slots)
+                rod = target
+            result |= rod << shift
+        return result
+
+    def moved_bit(self, previous: int, state: int) -> int:
+        """Младший бит поля диска, сдвинутого ходом previous -> state."""
+        changed = previous ^ state
+        lowest = changed & -changed
+        bits = self.engine.bits_per_disk
+        return 1 << ((lowest.bit_length() - 1) // bits * bits)
+
+    def get_next_situations(self, state: int, previous: Optional[int] = None,
+                            gradient: bool = False) -> List[Tuple[int, Tuple[str, str]]]:
+        """
+        Аналог PackedHanoi.get_next_situations без ходов диска, сдвинутого последним.
+        Args:
+            state: Текущее состояние.
+            previous: Состояние до последнего хода (None - ход первый).
+            gradient: Упорядочить ходы по оценке состояния.
+        """
+        engine = self.engine
+        last_bit = self.moved_bit(previous, state) if previous is not None else 0
+        if gradient:
+            return [(next_state, move) for next_state, move, _ in engine.scored_successors(state, True, last_bit)]
+        tops = [engine.top_bit(state, rod) for rod in range(engine.num_rods)]
+        moves = engine.moves
+        next_situations = []
+        for src, dst in engine.pairs:
+            bit = tops[src]
+            if not bit or bit == last_bit:
+                continue
+            dst_bit = tops[dst]
+            if not dst_bit or dst_bit > bit:
+                next_situations.append((state + (dst - src) * bit, moves[src][dst]))
+        return next_situations
+
+
+@lru_cache(maxsize=64)
+def get_reducer(num_disks: int, goal_state: int, rod_names: Tuple[str, ...] = ROD_NAMES) -> SymmetryReducer:
+    """Вернуть общий (кешированный) SymmetryReducer для цели."""
+    return SymmetryReducer(num_disks, goal_state, rod_names)
@@ -9,7 +9,8 @@ Tree.py
 Модуль, реализующий логику дерева
 """
 
-from typing import List, Any, Tuple
+from array import array
+from typing import List, Any, Tuple, Dict
 
 from Node import Node
 
@@ -26,4 +27,64 @@ class Tree:
         while current.move is not None:
             path.append(current.move)
             current = current.parent
-        return path[::-1]
\ No newline at end of file
+        return path[::-1]
+
+
+class ArrayTree:
+    """
+    Компактное дерево состояний на параллельных массивах (вместо графа объектов Node).
+    Узел - это индекс: состояние, родитель, код хода и глубина хранятся в отдельных колонках.
+    Упакованные (int) состояния лежат в array('Q'), прочие - в обычном списке.
+    """
+    ROOT = 0
+    NO_PARENT = -1
+
+    def __init__(self, root_situation: Any):
+        self.states = array('Q') if isinstance(root_situation, int) else []
+        self.parents = array('q')
+        self.move_codes = array('B')
+        self.depths = array('I')
+        self.moves: List[Tuple[str, str]] = []  # Таблица ходов: код -> ход
+        self._move_codes: Dict[Tuple[str, str], int] = {}
+        self._append(root_situation, self.NO_PARENT, 0, 0)
+
+    def _append(self, situation: Any, parent: int, move_code: int, depth: int) -> int:
+        try:
+            self.states.append(situation)
+        except (OverflowError, TypeError):
+            # Состояние не помещается в 64 бита - переходим на список
+            self.states = list(self.states)
+            self.states.append(situation)
+        self.parents.append(parent)
+        self.move_codes.append(move_code)
+        self.depths.append(depth)
+        return len(self.parents) - 1
+
+    def add_node(self, situation: Any, parent: int, move: Tuple[str, str]) -> int:
+        """Добавить узел и вернуть его индекс."""
+        code = self._move_codes.get(move)
+        if code is None:
+            code = len(self.moves)
+            self.moves.append(move)
+            self._move_codes[move] = code
+        return self._append(situation, parent, code, self.depths[parent] + 1)
+
+    def situation(self, index: int) -> Any:
+        """Состояние узла."""
+        return self.states[index]
+
+    def depth(self, index: int) -> int:
+        """Глубина узла."""
+        return self.depths[index]
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def get_path_to_node(self, index: int) -> List[Tuple[str, str]]:
+        """Получить путь (список ходов) от корня до узла с указанным индексом."""
+        path = []
+        parents, move_codes, moves = self.parents, self.move_codes, self.moves
+        while index != self.ROOT:
+            path.append(moves[move_codes[index]])
+            index = parents[index]
+        return path[::-1]
@@ -0,0 +1,128 @@
+"""
+VectorBFS.py
+==========
+Дата: 08.11.2025
+Разработчик: Архипкин Вячеслав
+==========
+Описание:
+---------
+Поиск в ширину по уровням с векторизацией на NumPy.
+Фронт хранится массивом упакованных состояний (uint64, см. PackedState),
+верхние диски и допустимые ходы вычисляются сразу для всего фронта.
+Граф ходов неориентированный, поэтому дубликаты уровня d+1 отсеиваются
+только по уровням d и d-1 (np.isin) и внутри самого уровня (np.unique).
+Для восстановления пути на каждом уровне хранятся индекс родителя и код хода.
+NumPy - необязательная зависимость.
+"""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy не установлен
+    np = None
+
+from PackedState import ROD_NAMES, get_engine
+
+MAX_DISKS = 32  # 2 бита на диск в uint64 (три-четыре стержня)
+STATE_BITS = 64
+
+
+def _top_bits(states: Any, pattern: Any, low_bits: Any, bits_per_disk: int = 2) -> Any:
+    """Младший бит поля верхнего диска стержня для каждого состояния (0 - стержень пуст)."""
+    x = states ^ pattern
+    folded = x | (x >> np.uint64(1))
+    for shift in range(2, bits_per_disk):
+        folded |= x >> np.uint64(shift)
+    empty = ~folded & low_bits
+    return empty & (~empty + np.uint64(1))
+
+
+def solve_vectorized(start: int, goal: int, num_disks: int, max_depth: int,
+                     rod_names: Tuple[str, ...] = ROD_NAMES,
+                     progress: Optional[Callable[[int, int, int, int], None]] = None) -> \
+        Optional[List[Tuple[str, str]]]:
+    """
+    Найти кратчайший путь между упакованными состояниями.
+    Args:
+        start: Начальное состояние (PackedHanoi.encode).
+        goal: Целевое состояние.
+        num_disks: Количество дисков (не больше 32 для трёх-четырёх стержней).
+        max_depth: Максимальная глубина поиска.
+        rod_names: Имена стержней (их число задаёт ширину поля диска).
+        progress: Функция, вызываемая после каждого уровня с аргументами (раскрыто, сгенерировано,
+            принято всего, размер нового уровня); исключение из неё прерывает поиск.
+    Returns:
+        Список шагов или None, если решение не найдено.
+    """
+    if np is None:
+        raise ImportError("Для solve_vectorized требуется NumPy.")
+    engine = get_engine(num_disks, rod_names)
+    if engine.bits_per_disk * num_disks > STATE_BITS:
+        raise ValueError(f"Векторизованный поиск поддерживает не больше {STATE_BITS // engine.bits_per_disk} "
+                         f"дисков на {engine.num_rods} стержнях.")
+    if start == goal:
+        return []
+
+    low_bits = np.uint64(engine.low_bits)
+    patterns = [np.uint64(pattern) for pattern in engine.rod_patterns]
+    goal_state = np.uint64(goal)
+
+    previous = np.empty(0, dtype=np.uint64)
+    current = np.array([start], dtype=np.uint64)
+    # parents[d][i], codes[d][i] - родитель и код хода i-го состояния уровня d + 1
+    parents: List[Any] = []
+    codes: List[Any] = []
+    accepted = 0
+
+    for _ in range(max_depth):
+        tops = [_top_bits(current, pattern, low_bits, engine.bits_per_disk) for pattern in patterns]
+        children, child_parents, child_codes = [], [], []
+        for code, (source, destination) in enumerate(engine.pairs):
+            top_source, top_destination = tops[source], tops[destination]
+            mask = (top_source != 0) & ((top_destination == 0) | (top_destination > top_source))
+            index = np.nonzero(mask)[0]
+            if not index.size:
+                continue
+            moved = top_source[index]
+            children.append(current[index] - np.uint64(source) * moved + np.uint64(destination) * moved)
+            child_parents.append(index)
+            child_codes.append(np.full(index.size, code, dtype=np.uint8))
+        if not children:
+            return None
+
+        level = np.concatenate(children)
+        generated = level.size
+        level_parents = np.concatenate(child_parents)
+        level_codes = np.concatenate(child_codes)
+
+        # Отсев повторов: внутри уровня и по двум предыдущим уровням
+        level, first = np.unique(level, return_index=True)
+        level_parents, level_codes = level_parents[first], level_codes[first]
+        fresh = ~(np.isin(level, current, assume_unique=True) | np.isin(level, previous, assume_unique=True))
+        level, level_parents, level_codes = level[fresh], level_parents[fresh], level_codes[fresh]
+        accepted += level.size
+        if progress is not None:
+            progress(current.size, generated, accepted, level.size)
+        if not level.size:
+            return None
+
+        parents.append(level_parents)
+        codes.append(level_codes)
+        previous, current = current, level
+
+        found = np.nonzero(level == goal_state)[0]
+        if found.size:
+            return _rebuild_path(engine, parents, codes, int(found[0]))
+
+    return None
+
+
+def _rebuild_path(engine: Any, parents: List[Any], codes: List[Any], index: int) -> List[Tuple[str, str]]:
+    """Восстановить путь по индексам родителей, поднимаясь от последнего уровня к корню."""
+    path = []
+    for level in range(len(parents) - 1, -1, -1):
+        source, destination = engine.pairs[codes[level][index]]
+        path.append(engine.moves[source][destination])
+        index = int(parents[level][index])
+    return path[::-1]